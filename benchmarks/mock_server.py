@@ -0,0 +1,336 @@
+"""
+Stand-in for the pd, glz, shared and lockfile-local Riot endpoints used by valclient.Client
+serves canned payloads sized like the real ones (a full match details payload, the content service dump, etc.)
+"""
+import base64
+import hashlib
+import json
+import random
+import re
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+rng = random.Random(0)
+
+
+def _uuid():
+    return str(uuid.UUID(int=rng.getrandbits(128)))
+
+
+def _jwt(payload):
+    encode = lambda data: base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip("=")
+    return f"{encode({'alg': 'none'})}.{encode(payload)}.signature"
+
+
+def build_match_details(match_id, rounds=24, players=10):
+    """A completed match with the same shape and roughly the same size as match-details/v1"""
+    puuids = [_uuid() for _ in range(players)]
+    agents = [_uuid() for _ in range(players)]
+    weapons = [_uuid() for _ in range(8)]
+
+    def location():
+        return {"x": rng.randint(-8000, 8000), "y": rng.randint(-8000, 8000)}
+
+    def kill(round_num):
+        killer, victim = rng.sample(puuids, 2)
+        return {
+            "gameTime": rng.randint(0, 2000000),
+            "roundTime": rng.randint(0, 100000),
+            "round": round_num,
+            "killer": killer,
+            "victim": victim,
+            "victimLocation": location(),
+            "assistants": rng.sample(puuids, rng.randint(0, 2)),
+            "playerLocations": [
+                {"subject": puuid, "viewRadians": rng.random() * 6.28, "location": location()}
+                for puuid in puuids
+            ],
+            "finishingDamage": {
+                "damageType": "Weapon",
+                "damageItem": rng.choice(weapons),
+                "isSecondaryFireMode": False,
+            },
+        }
+
+    round_results = []
+    for round_num in range(rounds):
+        player_stats = []
+        for puuid in puuids:
+            kills = [kill(round_num) for _ in range(rng.randint(0, 2))]
+            player_stats.append(
+                {
+                    "subject": puuid,
+                    "kills": kills,
+                    "damage": [
+                        {
+                            "receiver": rng.choice(puuids),
+                            "damage": rng.randint(1, 150),
+                            "legshots": rng.randint(0, 2),
+                            "bodyshots": rng.randint(0, 3),
+                            "headshots": rng.randint(0, 1),
+                        }
+                        for _ in range(rng.randint(0, 4))
+                    ],
+                    "score": rng.randint(0, 600),
+                    "economy": {
+                        "loadoutValue": rng.randint(0, 5000),
+                        "weapon": rng.choice(weapons),
+                        "armor": _uuid(),
+                        "remaining": rng.randint(0, 9000),
+                        "spent": rng.randint(0, 5000),
+                    },
+                    "ability": {},
+                    "wasAfk": False,
+                    "wasPenalized": False,
+                    "stayedInSpawn": False,
+                }
+            )
+        round_results.append(
+            {
+                "roundNum": round_num,
+                "roundResult": rng.choice(["Eliminated", "Bomb detonated", "Bomb defused"]),
+                "roundCeremony": "CeremonyDefault",
+                "winningTeam": rng.choice(["Red", "Blue"]),
+                "bombPlanter": rng.choice(puuids),
+                "plantRoundTime": rng.randint(0, 100000),
+                "plantPlayerLocations": None,
+                "plantLocation": location(),
+                "plantSite": rng.choice(["A", "B"]),
+                "playerStats": player_stats,
+                "roundResultCode": "Elimination",
+                "playerEconomies": [
+                    {
+                        "subject": puuid,
+                        "loadoutValue": rng.randint(0, 5000),
+                        "weapon": rng.choice(weapons),
+                        "armor": _uuid(),
+                        "remaining": rng.randint(0, 9000),
+                        "spent": rng.randint(0, 5000),
+                    }
+                    for puuid in puuids
+                ],
+            }
+        )
+
+    return {
+        "matchInfo": {
+            "matchId": match_id,
+            "mapId": "/Game/Maps/Ascent/Ascent",
+            "gameLengthMillis": 2400000,
+            "gameStartMillis": 1620000000000,
+            "isCompleted": True,
+            "queueID": "competitive",
+            "isRanked": True,
+            "seasonId": _uuid(),
+        },
+        "players": [
+            {
+                "subject": puuid,
+                "gameName": f"player{i}",
+                "tagLine": "0000",
+                "teamId": "Red" if i < players // 2 else "Blue",
+                "characterId": agents[i],
+                "stats": {
+                    "score": rng.randint(1000, 8000),
+                    "roundsPlayed": rounds,
+                    "kills": rng.randint(0, 30),
+                    "deaths": rng.randint(0, 30),
+                    "assists": rng.randint(0, 15),
+                },
+                "competitiveTier": rng.randint(3, 27),
+            }
+            for i, puuid in enumerate(puuids)
+        ],
+        "teams": [
+            {"teamId": "Red", "won": True, "roundsPlayed": rounds, "roundsWon": 13},
+            {"teamId": "Blue", "won": False, "roundsPlayed": rounds, "roundsWon": rounds - 13},
+        ],
+        "roundResults": round_results,
+        "kills": [kill(rng.randint(0, rounds - 1)) for _ in range(rounds * 7)],
+    }
+
+
+def build_content():
+    """A content-service/v3 dump with about as many entries as the live one"""
+    def items(count, prefix):
+        return [
+            {"Name": f"{prefix} {i}", "LocalizedNames": None, "ID": _uuid().upper(), "AssetName": f"{prefix}_{i}_PrimaryAsset", "AssetPath": f"/Game/{prefix}/{i}", "IsEnabled": True}
+            for i in range(count)
+        ]
+
+    return {
+        "DisabledIDs": [],
+        "Seasons": items(40, "Season"),
+        "Events": items(20, "Event"),
+        "Characters": items(25, "Agent"),
+        "Maps": items(15, "Map"),
+        "Chromas": items(1500, "Chroma"),
+        "Skins": items(1200, "Skin"),
+        "SkinLevels": items(2500, "SkinLevel"),
+        "Equips": items(20, "Equip"),
+        "GameModes": items(15, "GameMode"),
+        "Sprays": items(600, "Spray"),
+        "SprayLevels": items(600, "SprayLevel"),
+        "Charms": items(500, "Charm"),
+        "CharmLevels": items(500, "CharmLevel"),
+        "PlayerCards": items(700, "PlayerCard"),
+        "PlayerTitles": items(300, "PlayerTitle"),
+        "StorefrontItems": [],
+        "Themes": items(100, "Theme"),
+        "Contracts": items(80, "Contract"),
+    }
+
+
+def build_presences(puuids):
+    return {
+        "presences": [
+            {
+                "puuid": puuid,
+                "game_name": f"friend{i}",
+                "game_tag": "0000",
+                "product": "valorant",
+                "state": "chat",
+                "private": base64.b64encode(
+                    json.dumps(
+                        {
+                            "isValid": True,
+                            "sessionLoopState": "MENUS",
+                            "partyId": _uuid(),
+                            "queueId": "competitive",
+                            "competitiveTier": rng.randint(3, 27),
+                            "accountLevel": rng.randint(1, 400),
+                            "playerCardId": _uuid(),
+                        }
+                    ).encode()
+                ).decode(),
+            }
+            for i, puuid in enumerate(puuids)
+        ]
+    }
+
+
+class MockRiotServer:
+    def __init__(self, friends=200, history=60, latency=0):
+        """
+        friends: number of presences served by /chat/v4/presences
+        history: number of matches in the player's match history
+        latency: seconds every response is delayed by, to mimic network round trips
+        """
+        self.puuid = _uuid()
+        self.friend_puuids = [_uuid() for _ in range(friends)]
+        self.match_ids = [_uuid() for _ in range(history)]
+        self.latency = latency
+        self.match_details = build_match_details(self.match_ids[0])
+        self.bodies = {
+            "content": json.dumps(build_content()).encode(),
+            "presences": json.dumps(build_presences([self.puuid] + self.friend_puuids)).encode(),
+            "match_details": json.dumps(self.match_details).encode(),
+        }
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self.__handler())
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def route(self, path):
+        """Get the response body for a request path"""
+        path, _, query = path.partition("?")
+        if path == "/entitlements/v1/token":
+            return json.dumps(
+                {
+                    "accessToken": _jwt({"sub": self.puuid, "exp": 4102444800}),
+                    "token": _jwt({"entitlements": []}),
+                    "subject": self.puuid,
+                }
+            ).encode()
+        if path == "/chat/v1/session":
+            return json.dumps({"game_name": "bench", "game_tag": "0000", "puuid": self.puuid}).encode()
+        if path == "/chat/v4/presences":
+            return self.bodies["presences"]
+        if path == "/content-service/v3/content":
+            return self.bodies["content"]
+        if path.startswith("/match-details/v1/matches/"):
+            return self.bodies["match_details"]
+        match = re.match(r"/match-history/v1/history/([^/]+)", path)
+        if match:
+            params = dict(p.split("=") for p in query.split("&") if "=" in p)
+            start, end = int(params.get("startIndex", 0)), int(params.get("endIndex", 15))
+            return json.dumps(
+                {
+                    "Subject": match.group(1),
+                    "BeginIndex": start,
+                    "EndIndex": end,
+                    "Total": len(self.match_ids),
+                    "History": [
+                        {"MatchID": match_id, "GameStartTime": 1620000000000 - i * 3600000, "QueueID": "competitive"}
+                        for i, match_id in enumerate(self.match_ids)
+                    ][start:end],
+                }
+            ).encode()
+        if path.startswith("/mmr/v1/players/"):
+            return json.dumps(
+                {
+                    "Subject": self.puuid,
+                    "LatestCompetitiveUpdate": {"SeasonID": _uuid(), "TierAfterUpdate": 12},
+                    "QueueSkills": {"competitive": {"TotalGamesNeededForRating": 0}},
+                }
+            ).encode()
+        if path.startswith("/parties/v1/players/"):
+            return json.dumps({"Subject": self.puuid, "CurrentPartyID": "party", "Requests": [], "Invites": []}).encode()
+        if path.startswith("/core-game/v1/players/"):
+            return json.dumps({"Subject": self.puuid, "MatchID": "coregame"}).encode()
+        if path.startswith("/core-game/v1/matches/"):
+            return json.dumps({"MatchID": "coregame", "State": "IN_PROGRESS", "Players": []}).encode()
+        return None
+
+    def __handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the real servers
+            # headers and body go out in separate writes; with Nagle on, every keep-alive response
+            # after the first stalls on the client's delayed ACK
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                if server.latency:
+                    threading.Event().wait(server.latency)
+                body = server.route(self.path)
+                etag = None
+                if body is not None and self.path.startswith("/content-service/"):
+                    # content only changes with a patch, so it's served with a validator like the real one
+                    etag = '"' + hashlib.md5(body).hexdigest() + '"'
+                    if self.headers.get("If-None-Match") == etag:
+                        self.send_response(304)
+                        self.send_header("ETag", etag)
+                        self.send_header("Content-Length", "0")
+                        self.end_headers()
+                        return
+                if body is None:
+                    body = json.dumps({"httpStatus": 404, "errorCode": "RESOURCE_NOT_FOUND"}).encode()
+                    self.send_response(404)
+                else:
+                    self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                if etag is not None:
+                    self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
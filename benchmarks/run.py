@@ -0,0 +1,254 @@
+"""
+Benchmarks valclient against the local stand-in server in mock_server.py
+
+    python benchmarks/run.py                       # run everything, save results/<version>-<time>.json
+    python benchmarks/run.py --compare results/old.json
+    python benchmarks/run.py --only fetch_sync activation --latency 0.02
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+here = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(here, "..", "src"))
+sys.path.insert(0, here)
+
+from valclient import Client, ResponseCache  # noqa: E402
+from mock_server import MockRiotServer  # noqa: E402
+
+try:
+    from valclient import AsyncClient
+    import aiohttp  # noqa: F401
+except ImportError:
+    AsyncClient = None
+
+
+def make_client(server, client_class=Client, **kwargs):
+    """Build a client that talks to the stand-in server instead of Riot"""
+    lockfile_dir = tempfile.mkdtemp()
+    os.environ["LOCALAPPDATA"] = lockfile_dir
+    client = client_class(region="na", client_version="release-bench-shipping-1-1", **kwargs)
+    with open(client.lockfile_path, "w") as f:
+        f.write(f"Riot Client:1:{server.server.server_address[1]}:password:http")
+    client.base_url = client.base_url_glz = client.base_url_shared = server.url
+    client.base_url_local = server.url
+    return client
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def summarize(durations):
+    durations = sorted(durations)
+    return {
+        "median_ms": statistics.median(durations) * 1000,
+        "p95_ms": durations[int(len(durations) * 0.95) - 1] * 1000,
+        "min_ms": durations[0] * 1000,
+    }
+
+
+# benchmarks: each takes the server and returns a dict of results; "primary" names the headline number
+def bench_fetch_sync(server, n=500):
+    client = make_client(server)
+    client.activate()
+    elapsed, _ = timed(lambda: [client.fetch_mmr() for _ in range(n)])
+    return {"primary": "requests_per_second", "requests_per_second": n / elapsed, "requests": n}
+
+
+def bench_fetch_concurrent(server, n=2000, workers=16):
+    client = make_client(server)
+    client.activate()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        elapsed, _ = timed(lambda: list(executor.map(lambda _: client.fetch_mmr(), range(n))))
+    return {"primary": "requests_per_second", "requests_per_second": n / elapsed, "requests": n, "workers": workers}
+
+
+def bench_activation(server, n=30):
+    durations = []
+    for _ in range(n):
+        client = make_client(server)
+        elapsed, _ = timed(client.activate)
+        durations.append(elapsed)
+        client.close()
+    results = summarize(durations)
+    results["primary"] = "median_ms"
+    return results
+
+
+def bench_presence(server, lookups=50):
+    client = make_client(server)
+    client.activate()
+    puuids = server.friend_puuids[:lookups]
+    one_by_one, _ = timed(lambda: [client.fetch_presence(puuid) for puuid in puuids])
+    bulk, _ = timed(client.fetch_presences, puuids)
+    return {
+        "primary": "bulk_ms",
+        "one_by_one_ms": one_by_one * 1000,
+        "bulk_ms": bulk * 1000,
+        "lookups": lookups,
+    }
+
+
+def bench_match_details_sync(server, n=50):
+    client = make_client(server)
+    client.activate()
+    elapsed, _ = timed(lambda: [client.fetch_match_details(match_id) for match_id in server.match_ids[:n]])
+    return {
+        "primary": "matches_per_second",
+        "matches_per_second": n / elapsed,
+        "payload_bytes": len(server.bodies["match_details"]),
+    }
+
+
+def bench_match_details_concurrent(server, n=50, workers=8):
+    # same setup as match_details_sync (no match store), so the pair only differs in concurrency
+    client = make_client(server)
+    client.activate()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        elapsed, _ = timed(lambda: list(executor.map(client.fetch_match_details, server.match_ids[:n])))
+    return {"primary": "matches_per_second", "matches_per_second": n / elapsed, "workers": workers}
+
+
+def bench_content(server, n=20):
+    client = make_client(server)
+    client.activate()
+    durations = [timed(client.fetch_content)[0] for _ in range(n)]
+    results = summarize(durations)
+    results["primary"] = "median_ms"
+    results["payload_bytes"] = len(server.bodies["content"])
+    return results
+
+
+def bench_content_revalidate(server, n=20):
+    # a zero TTL makes every call revalidate the cached content with a conditional GET
+    client = make_client(server, cache=ResponseCache(ttls={"/content-service/v3/content": 0}))
+    client.activate()
+    client.fetch_content()
+    durations = [timed(client.fetch_content)[0] for _ in range(n)]
+    results = summarize(durations)
+    results["primary"] = "median_ms"
+    results["revalidations"] = client.cache.stats()["revalidations"]
+    return results
+
+
+def bench_fetch_async(server, n=2000):
+    async def run():
+        async with make_client(server, AsyncClient) as client:
+            await client.activate()
+            start = time.perf_counter()
+            await asyncio.gather(*[client.fetch_mmr() for _ in range(n)])
+            return time.perf_counter() - start
+
+    elapsed = asyncio.run(run())
+    return {"primary": "requests_per_second", "requests_per_second": n / elapsed, "requests": n}
+
+
+def bench_match_details_async(server, n=50):
+    async def run():
+        async with make_client(server, AsyncClient) as client:
+            await client.activate()
+            start = time.perf_counter()
+            await asyncio.gather(*[client.fetch_match_details(match_id) for match_id in server.match_ids[:n]])
+            return time.perf_counter() - start
+
+    elapsed = asyncio.run(run())
+    return {"primary": "matches_per_second", "matches_per_second": n / elapsed}
+
+
+benchmarks = {
+    "fetch_sync": bench_fetch_sync,
+    "fetch_concurrent": bench_fetch_concurrent,
+    "activation": bench_activation,
+    "presence": bench_presence,
+    "match_details_sync": bench_match_details_sync,
+    "match_details_concurrent": bench_match_details_concurrent,
+    "content": bench_content,
+    "content_revalidate": bench_content_revalidate,
+    "fetch_async": bench_fetch_async,
+    "match_details_async": bench_match_details_async,
+}
+async_benchmarks = {"fetch_async", "match_details_async"}
+
+
+def library_version():
+    try:
+        from importlib.metadata import version
+
+        return version("valclient")
+    except Exception:
+        return "dev"
+
+
+def compare(results, baseline_path):
+    with open(baseline_path) as f:
+        baseline = json.load(f)["results"]
+    print(f"\n{'benchmark':<28}{'metric':<22}{'baseline':>12}{'current':>12}{'change':>10}")
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        metric = result["primary"]
+        old, new = baseline[name][metric], result[metric]
+        change = (new - old) / old * 100 if old else 0
+        print(f"{name:<28}{metric:<22}{old:>12.1f}{new:>12.1f}{change:>9.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="valclient benchmarks against a local stand-in server")
+    parser.add_argument("--only", nargs="*", choices=list(benchmarks), help="benchmarks to run (default: all)")
+    parser.add_argument("--latency", type=float, default=0, help="seconds of simulated network latency per response")
+    parser.add_argument("--output", help="where to save results (default: benchmarks/results/<version>-<time>.json)")
+    parser.add_argument("--compare", help="previous results file to compare against")
+    args = parser.parse_args()
+
+    server = MockRiotServer(latency=args.latency).start()
+    results = {}
+    try:
+        for name in args.only or list(benchmarks):
+            if name in async_benchmarks and AsyncClient is None:
+                print(f"{name:<28}skipped (aiohttp not installed)")
+                continue
+            results[name] = benchmarks[name](server)
+            primary = results[name]["primary"]
+            print(f"{name:<28}{primary:<22}{results[name][primary]:>12.1f}")
+    finally:
+        server.stop()
+
+    output = args.output
+    if output is None:
+        stamp = datetime.datetime.utcnow().strftime("%Y%m%dT%H%M%S")
+        output = os.path.join(here, "results", f"{library_version()}-{stamp}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(
+            {
+                "meta": {
+                    "version": library_version(),
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "latency": args.latency,
+                    "time": datetime.datetime.utcnow().isoformat(),
+                },
+                "results": results,
+            },
+            f,
+            indent=2,
+        )
+    print(f"\nsaved results to {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,51 @@
 from .client import Client
+from .async_client import AsyncClient
+from .sessions import SessionPool
+from .cache import ResponseCache
+from .match_store import MatchStore
+from .catalog import ContentCatalog
+from .tokens import TokenManager, AsyncTokenManager
+from .version import VersionCache
+from .ratelimit import RequestScheduler
+from .retry import RetryPolicy
+from .presence import Presence, PresenceSnapshot
+from .events import LocalEvent, LocalEventStream
+from .leaderboard import LeaderboardCrawler, NDJSONWriter, CSVWriter
+from .metrics import Metrics
+from .matches import Match, Player, Round, Kill, DamageEvent
+from .columnar import MatchColumns
+from .pool import ClientPool
+from .watermarks import WatermarkStore, MemoryWatermarkStore, JSONWatermarkStore
 
-__all__ = ["Client"]
+__all__ = [
+    "Client",
+    "AsyncClient",
+    "SessionPool",
+    "ResponseCache",
+    "MatchStore",
+    "WatermarkStore",
+    "MemoryWatermarkStore",
+    "JSONWatermarkStore",
+    "ContentCatalog",
+    "TokenManager",
+    "AsyncTokenManager",
+    "VersionCache",
+    "RequestScheduler",
+    "RetryPolicy",
+    "Presence",
+    "PresenceSnapshot",
+    "LocalEvent",
+    "LocalEventStream",
+    "LeaderboardCrawler",
+    "NDJSONWriter",
+    "CSVWriter",
+    "Metrics",
+    "Match",
+    "Player",
+    "Round",
+    "Kill",
+    "DamageEvent",
+    "MatchColumns",
+    "ClientPool",
+]
 __author__ = "colinhartigan"
@@ -0,0 +1,1140 @@
+# module imports
+import typing as t
+import asyncio
+import json
+import time
+
+try:
+    import aiohttp
+except ImportError:  # aiohttp is only needed for AsyncClient
+    aiohttp = None
+
+# imports for modules used in the package
+from .client import Client, retries_stale_id
+from .cache import ResponseCache, conditional_headers
+from .match_store import MatchStore
+from .watermarks import WatermarkStore
+from .catalog import ContentCatalog
+from .tokens import AsyncTokenManager, token_expiry
+from .version import VersionCache
+from .ratelimit import RequestScheduler, parse_retry_after
+from .retry import RetryPolicy
+from .presence import PresenceSnapshot
+from .metrics import Metrics, calling_method, label_endpoints
+
+# exceptions
+from .exceptions import ResponseError, HandshakeError, PhaseError
+
+
+@label_endpoints
+class AsyncClient(Client):
+    def __init__(
+        self,
+        region: t.Text = "na",
+        auth: t.Optional[t.Mapping] = None,
+        cache: t.Optional[ResponseCache] = None,
+        match_store: t.Optional[MatchStore] = None,
+        version_cache: t.Optional[VersionCache] = None,
+        client_version: t.Optional[t.Text] = None,
+        scheduler: t.Optional[RequestScheduler] = None,
+        retry_policy: t.Optional[RetryPolicy] = None,
+        metrics: t.Optional[Metrics] = None,
+        json_decoder: t.Optional[t.Callable[[bytes], t.Any]] = None,
+        connection_limit: int = 100,
+        connection_limit_per_host: int = 0,
+    ):
+        """
+        asyncio version of Client; every endpoint method returns an awaitable
+        requires aiohttp (pip install aiohttp)
+
+        cache: ResponseCache for slow-changing endpoints like content and config (disabled by default)
+        match_store: MatchStore that fetch_match_details reads finished matches from before going to pd
+        version_cache: VersionCache for the client version header (in-memory, 1 hour TTL by default)
+        client_version: pin the client version instead of looking it up on valorant-api.com
+        scheduler: RequestScheduler with per-family/shard request budgets
+        retry_policy: RetryPolicy for connection errors, timeouts, 5xx and 429
+        metrics: Metrics to record request counts, latency, status codes, bytes and re-auths in
+        json_decoder: function that parses a raw response body (bytes); orjson.loads if orjson is installed
+        connection_limit: max connections open at once across all hosts
+        connection_limit_per_host: max connections open at once to a single host (0 for no limit)
+
+        NOTE: when using manual auth, local endpoints will not be available
+        """
+        if aiohttp is None:
+            raise ImportError("AsyncClient requires aiohttp; install it with pip install aiohttp")
+
+        super().__init__(
+            region=region,
+            auth=auth,
+            cache=cache,
+            match_store=match_store,
+            version_cache=version_cache,
+            client_version=client_version,
+            scheduler=scheduler,
+            retry_policy=retry_policy,
+            metrics=metrics,
+            json_decoder=json_decoder,
+        )
+        self.connection_limit = connection_limit
+        self.connection_limit_per_host = connection_limit_per_host
+        self.http_session = None
+        self.closed = False
+        self.token_manager = AsyncTokenManager(self._refresh_tokens)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def activate(self, prewarm: bool = False) -> None:
+        """
+        Activate the client and get authorization
+        The independent handshake steps (tokens, client version, chat session) run concurrently
+        prewarm: also open connections to the pd/glz/shared servers so the first calls skip DNS/TLS setup
+        """
+        try:
+            steps = []
+            if prewarm:
+                steps.append(self.prewarm())
+            if self.auth is None:
+                self.lockfile = self._get_lockfile()
+                # the chat session only needs the lockfile, so it doesn't wait for the tokens
+                self.local_headers = self._build_local_headers()
+                results = await asyncio.gather(self.rnet_fetch_chat_session(), self.token_manager.refresh(), *steps)
+                session = results[0]
+                self.player_name = session["game_name"]
+                self.player_tag = session["game_tag"]
+            else:
+                await asyncio.gather(self.token_manager.refresh(), *steps)
+        except:
+            raise HandshakeError("Unable to activate; is VALORANT running?")
+
+    @classmethod
+    async def from_state(cls, state: t.Union[t.Mapping[str, t.Any], t.Text], **kwargs) -> "AsyncClient":
+        """
+        Build a client from export_state() output (or the file it was saved to)
+        kwargs are passed to the constructor; the client activates normally if the snapshot is stale, missing or unreadable
+        """
+        state = cls._load_state(state)
+        if state is not None:
+            kwargs.setdefault("region", state["region"])
+        client = cls(**kwargs)
+        if state is None or not client._restore_state(state):
+            await client.activate()
+        return client
+
+    async def prewarm(self, timeout: float = 5) -> None:
+        """Open a pooled connection to each of the pd/glz/shared servers; failures are ignored"""
+        session = self._get_http_session()
+
+        async def connect(url):
+            try:
+                async with session.head(f"{url}/", timeout=aiohttp.ClientTimeout(total=timeout)):
+                    pass
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                pass
+
+        await asyncio.gather(*[connect(url) for url in [self.base_url, self.base_url_glz, self.base_url_shared]])
+
+    async def close(self) -> None:
+        """Close the aiohttp session held by the client; it can't make requests afterwards"""
+        self.closed = True
+        if self.http_session is not None:
+            await self.http_session.close()
+            self.http_session = None
+        super().close()
+
+    async def request(
+        self,
+        method,
+        endpoint="/",
+        endpoint_type="pd",
+        json_data=None,
+        exceptions={},
+        raw=False,
+        headers=None,
+        response_headers=None,
+    ) -> t.Tuple[int, t.Any]:
+        """
+        Send a request to a pd/glz/shared/local endpoint and return the status code and decoded body
+        raw: return the undecoded body (bytes) instead
+        headers: extra request headers on top of the client's auth headers
+        response_headers: dict the response headers are copied into
+        """
+        if endpoint_type != "local":
+            await self.token_manager.ensure_fresh()
+        session = self._get_http_session()
+        kwargs = {}
+        if endpoint_type == "local":
+            kwargs["ssl"] = False
+        if json_data is not None:
+            # same as Client: post sends a json body, put/delete send the serialized string
+            if method == "POST":
+                kwargs["json"] = json_data
+            else:
+                kwargs["data"] = json.dumps(json_data)
+
+        request_headers = self.local_headers if endpoint_type == "local" else self.headers
+        if headers:
+            request_headers = {**(request_headers or {}), **headers}
+
+        policy = self.retry_policy
+        timeout = aiohttp.ClientTimeout(total=policy.timeout)
+        method_name = None
+        if self.metrics is not None:
+            method_name = calling_method(method.lower())
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            await self.scheduler.acquire_async(endpoint_type, self.shard)
+            status = None
+            error = None
+            retry_after = None
+            body = b""
+            sent_at = time.monotonic()
+            try:
+                async with session.request(
+                    method,
+                    f"{self._get_base_url(endpoint_type)}{endpoint}",
+                    headers=request_headers,
+                    timeout=timeout,
+                    **kwargs,
+                ) as response:
+                    status = response.status
+                    if response_headers is not None:
+                        response_headers.update(response.headers)
+                    if status == 429:
+                        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                    body = await response.read()
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                error = e
+
+            if self.metrics is not None:
+                sent = kwargs.get("data") or (json.dumps(kwargs["json"]) if "json" in kwargs else "")
+                self.metrics.observe(
+                    endpoint_type,
+                    method_name,
+                    status,
+                    time.monotonic() - sent_at,
+                    bytes_in=len(body),
+                    bytes_out=len(sent),
+                )
+
+            elapsed = time.monotonic() - started
+            # the total timeout can expire after the server got the request
+            timed_out = isinstance(error, asyncio.TimeoutError)
+            delay = policy.next_delay(attempt, elapsed, status, error, retry_after, method, timed_out)
+            policy.report(
+                method=method,
+                endpoint=endpoint,
+                endpoint_type=endpoint_type,
+                attempt=attempt,
+                status=status,
+                error=error,
+                elapsed=elapsed,
+                delay=delay,
+            )
+            if delay is None:
+                break
+            if status == 429:
+                # the scheduler makes every request to this family wait, including the retry
+                self.scheduler.penalize(endpoint_type, self.shard, delay)
+            else:
+                await asyncio.sleep(delay)
+
+        if error is not None:
+            raise error
+        self._expire_session_state(endpoint, status)
+
+        # custom exceptions for http status codes
+        self._verify_status_code(status, exceptions)
+
+        if raw:
+            return status, body
+        try:
+            data = self.json_decoder(body)
+        except:  # callers decide whether a missing body is an error
+            data = None
+        return status, data
+
+    async def fetch(
+        self, endpoint="/", endpoint_type="pd", exceptions={}, raw=False
+    ) -> dict:  # exception: code: {Exception, Message}
+        """
+        Get data from a pd/glz/local endpoint
+        raw: return the undecoded response body (bytes) instead; raw responses aren't cached
+        """
+        ttl = None
+        if self.cache is not None and endpoint_type != "local" and not raw:
+            ttl = self.cache.ttl_for(endpoint)
+        if ttl is not None:
+            url = f"{self._get_base_url(endpoint_type)}{endpoint}"
+            data = self.cache.get(url)
+            if data is None:
+                data = await self.__fetch(endpoint, endpoint_type, exceptions, cache_entry=(url, ttl))
+            return data
+        return await self.__fetch(endpoint, endpoint_type, exceptions, raw=raw)
+
+    async def __fetch(
+        self, endpoint, endpoint_type, exceptions, refresh_on_400=True, raw=False, cache_entry=None
+    ) -> dict:
+        generation = self.token_manager.generation
+        # an expired cached response with an ETag/Last-Modified is revalidated instead of downloaded again
+        stale = self.cache.stale(cache_entry[0]) if cache_entry is not None else None
+        response_headers = {}
+        status, data = await self.request(
+            "GET",
+            endpoint=endpoint,
+            endpoint_type=endpoint_type,
+            exceptions=exceptions,
+            raw=raw or stale is not None,
+            headers=stale[1] if stale is not None else None,
+            response_headers=response_headers,
+        )
+
+        if stale is not None:
+            if status == 304:
+                self.cache.refresh(*cache_entry)
+                return stale[0]
+            try:
+                data = self.json_decoder(data)
+            except:
+                data = None
+
+        if raw:
+            rejected = status == 400
+        else:
+            if data is None:
+                raise ResponseError("Request returned NoneType")
+
+            if "httpStatus" not in data:
+                if cache_entry is not None:
+                    url, ttl = cache_entry
+                    self.cache.set(url, endpoint, data, ttl, validators=conditional_headers(response_headers))
+                return data
+            rejected = data["httpStatus"] == 400
+
+        if rejected and refresh_on_400:
+            # tokens were rejected; refresh once (or wait for a refresh already in flight) and retry
+            if self.metrics is not None:
+                self.metrics.observe_reauth(endpoint_type, calling_method("fetch"))
+            await self.token_manager.refresh(generation)
+            return await self.__fetch(
+                endpoint, endpoint_type, exceptions, refresh_on_400=False, raw=raw, cache_entry=cache_entry
+            )
+        if raw:
+            return data
+
+    async def post(
+        self, endpoint="/", endpoint_type="pd", json_data={}, exceptions={}, raw=False
+    ) -> dict:
+        """
+        Post data to a pd/glz endpoint
+        raw: return the undecoded response body (bytes)
+        """
+        _, data = await self.request(
+            "POST",
+            endpoint=endpoint,
+            endpoint_type=endpoint_type,
+            json_data=json_data,
+            exceptions=exceptions,
+            raw=raw,
+        )
+        return data
+
+    async def put(
+        self, endpoint="/", endpoint_type="pd", json_data={}, exceptions={}, raw=False
+    ) -> dict:
+        _, data = await self.request(
+            "PUT",
+            endpoint=endpoint,
+            endpoint_type=endpoint_type,
+            json_data=json_data,
+            exceptions=exceptions,
+            raw=raw,
+        )
+
+        if data is not None:
+            return data
+        else:
+            raise ResponseError("Request returned NoneType")
+
+    async def delete(
+        self, endpoint="/", endpoint_type="pd", json_data={}, exceptions={}, raw=False
+    ) -> dict:
+        _, data = await self.request(
+            "DELETE",
+            endpoint=endpoint,
+            endpoint_type=endpoint_type,
+            json_data=json_data,
+            exceptions=exceptions,
+            raw=raw,
+        )
+
+        if data is not None:
+            return data
+        else:
+            raise ResponseError("Request returned NoneType")
+
+    # --------------------------------------------------------------------------------------------------
+
+    # endpoints that only build a url and call fetch/post/put/delete are inherited from Client
+    # and return the awaitable directly; the ones below need to await something first
+
+    # PVP endpoints
+    async def fetch_leaderboard(
+        self, season: t.Text, start_index: int = 0, size: int = 25, region: t.Text = "na"
+    ) -> dict:
+        """
+        MMR_FetchLeaderboard
+        Get the competitive leaderboard for a given season
+        The query parameter query can be added to search for a username.
+        """
+        if season == "":
+            season = await self._get_live_season()
+        data = await self.fetch(
+            f"/mmr/v1/leaderboards/affinity/{region}/queue/competitive/season/{season}?startIndex={start_index}&size={size}",
+            endpoint_type="pd",
+        )
+        return data
+
+    async def fetch_content_catalog(self) -> ContentCatalog:
+        """
+        Get a ContentCatalog built from fetch_content() for UUID/name lookups
+        The catalog is kept until the client version changes
+        """
+        version = self.headers.get("X-Riot-ClientVersion")
+        if self.content_catalog is None or self.content_catalog.version != version:
+            self.content_catalog = ContentCatalog(await self.fetch_content(), version=version)
+        return self.content_catalog
+
+    async def fetch_match_details(self, match_id: t.Text) -> t.Mapping[str, t.Any]:
+        """
+        Get the full info for a previous match
+        Includes everything that the in-game match details screen shows including damage and kill positions, same as the official API w/ a production key
+        If the client has a match_store, finished matches are read from/saved to it
+        """
+        if self.match_store is not None:
+            data = self.match_store.get(match_id)
+            if data is not None:
+                return data
+        data = await self.fetch(
+            endpoint=f"/match-details/v1/matches/{match_id}", endpoint_type="pd"
+        )
+        if self.match_store is not None and MatchStore.is_complete(data):
+            self.match_store.put(match_id, data)
+        return data
+
+    async def preload_match_details(self, match_ids: t.Iterable[t.Text], max_concurrency: int = 16) -> int:
+        """
+        Download every match in match_ids that isn't in the client's match_store yet
+        Returns the number of matches that were downloaded
+        """
+        if self.match_store is None:
+            raise ValueError("preload_match_details requires a match_store")
+        missing = self.match_store.missing(match_ids)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def download(match_id):
+            async with semaphore:
+                return match_id, await self.fetch(
+                    endpoint=f"/match-details/v1/matches/{match_id}", endpoint_type="pd"
+                )
+
+        results = await asyncio.gather(*[download(match_id) for match_id in missing])
+        matches = {
+            match_id: data for match_id, data in results if MatchStore.is_complete(data)
+        }
+        self.match_store.put_many(matches)
+        return len(matches)
+
+    async def iter_match_history(
+        self,
+        puuid: t.Optional[t.Text] = None,
+        queue_id: t.Text = "null",
+        page_size: int = 20,
+    ) -> t.AsyncIterator[t.Mapping[str, t.Any]]:
+        """
+        Iterate over a player's whole match history, newest first
+        Pages are requested page_size matches at a time; the next page is fetched in the background while the current one is consumed
+        """
+        self._check_queue_type(queue_id)
+        puuid = self._check_puuid(puuid)
+        async for match in self._iter_pages(
+            lambda start: self.fetch_match_history(
+                puuid, start_index=start, end_index=start + page_size, queue_id=queue_id
+            ),
+            "History",
+            page_size,
+        ):
+            yield match
+
+    async def sync_match_history(
+        self,
+        watermarks: WatermarkStore,
+        puuid: t.Optional[t.Text] = None,
+        queue_id: t.Text = "null",
+        page_size: int = 20,
+    ) -> t.List[t.Mapping[str, t.Any]]:
+        """
+        Get the matches a player has played since the last sync, newest first
+        see Client.sync_match_history
+        """
+        self._check_queue_type(queue_id)
+        puuid = self._check_puuid(puuid)
+        key = puuid if queue_id == "null" else f"{puuid}:{queue_id}"
+        watermark = watermarks.get(key)
+
+        new_matches = []
+        start = 0
+        while True:
+            page = await self.fetch_match_history(
+                puuid, start_index=start, end_index=start + page_size, queue_id=queue_id
+            )
+            history = page.get("History") or []
+            for match in history:
+                if watermark is not None and self._reached_watermark(match, watermark):
+                    break
+                new_matches.append(match)
+            else:
+                start += page_size
+                if len(history) >= page_size and start < page.get("Total", 0):
+                    continue
+            break
+
+        if len(new_matches) > 0:
+            watermarks.set(
+                key,
+                {
+                    "MatchID": new_matches[0]["MatchID"],
+                    "GameStartTime": new_matches[0]["GameStartTime"],
+                },
+            )
+        return new_matches
+
+    async def iter_competitive_updates(
+        self,
+        puuid: t.Optional[t.Text] = None,
+        queue_id: t.Text = "competitive",
+        page_size: int = 20,
+    ) -> t.AsyncIterator[t.Mapping[str, t.Any]]:
+        """
+        Iterate over all of a player's competitive updates, newest first
+        Pages are requested page_size matches at a time; the next page is fetched in the background while the current one is consumed
+        """
+        self._check_queue_type(queue_id)
+        puuid = self._check_puuid(puuid)
+        async for match in self._iter_pages(
+            lambda start: self.fetch_competitive_updates(
+                puuid, start_index=start, end_index=start + page_size, queue_id=queue_id
+            ),
+            "Matches",
+            page_size,
+        ):
+            yield match
+
+    # party endpoints
+    async def party_fetch_player(self) -> t.Mapping[str, t.Any]:
+        """
+        Party_FetchPlayer
+        Get the Party ID that a given player belongs to
+        """
+        data = await self.fetch(
+            endpoint=f"/parties/v1/players/{self.puuid}", endpoint_type="glz"
+        )
+        self.session_state["party_id"] = data["CurrentPartyID"]
+        return data
+
+    async def party_remove_player(self, puuid: t.Text) -> t.NoReturn:
+        """
+        Party_RemovePlayer
+        Removes a player from the current party
+        """
+        puuid = self._check_puuid(puuid)
+        data = await self.delete(endpoint=f"/parties/v1/players/{puuid}", endpoint_type="glz")
+        if puuid == self.puuid:
+            self.session_state.pop("party_id", None)
+        return data
+
+    @retries_stale_id("party_id")
+    async def fetch_party(self) -> t.Mapping[str, t.Any]:
+        """
+        Party_FetchParty
+        Get details about a given party id
+        """
+        party_id = await self._get_current_party_id()
+        data = await self.fetch(
+            endpoint=f"/parties/v1/parties/{party_id}", endpoint_type="glz"
+        )
+        return data
+
+    @retries_stale_id("party_id")
+    async def party_set_member_ready(self, ready: bool) -> t.Mapping[str, t.Any]:
+        """
+        Party_SetMemberReady
+        Sets whether a party member is ready for queueing or not
+        """
+        party_id = await self._get_current_party_id()
+        data = await self.post(
+            endpoint=f"/parties/v1/parties/{party_id}/members/{self.puuid}/setReady",
+            endpoint_type="glz",
+            json_data={"ready": ready},
+        )
+        return data
+
+    @retries_stale_id("party_id")
+    async def party_refresh_competitive_tier(self) -> t.Mapping[str, t.Any]:
+        """
+        Party_RefreshCompetitiveTier
+        Refreshes the competitive tier for a player
+        """
+        party_id = await self._get_current_party_id()
+        data = await self.post(
+            endpoint=f"/parties/v1/parties/{party_id}/members/{self.puuid}/refreshCompetitiveTier",
+            endpoint_type="glz",
+        )
+        return data
+
+    @retries_stale_id("party_id")
+    async def party_refresh_player_identity(self) -> t.Mapping[str, t.Any]:
+        """
+        Party_RefreshPlayerIdentity
+        Refreshes the identity for a player
+        """
+        party_id = await self._get_current_party_id()
+        data = await self.post(
+            endpoint=f"/parties/v1/parties/{party_id}/members/{self.puuid}/refreshPlayerIdentity",
+            endpoint_type="glz",
+        )
+        return data
+
+    @retries_stale_id("party_id")
+    async def party_refresh_pings(self) -> t.Mapping[str, t.Any]:
+        """
+        Party_RefreshPings
+        Refreshes the pings for a player
+        """
+        party_id = await self._get_current_party_id()
+        data = await self.post(
+            endpoint=f"/parties/v1/parties/{party_id}/members/{self.puuid}/refreshPings",
+            endpoint_type="glz",
+        )
+        return data
+
+    @retries_stale_id("party_id")
+    async def party_change_queue(self, queue_id: t.Text) -> t.Mapping[str, t.Any]:
+        """
+        Party_ChangeQueue
+        Sets the matchmaking queue for the party
+        """
+        self._check_queue_type(queue_id)
+        party_id = await self._get_current_party_id()
+        data = await self.post(
+            endpoint=f"/parties/v1/parties/{party_id}/queue",
+            endpoint_type="glz",
+            json_data={"queueID": queue_id},
+        )
+        return data
+
+    @retries_stale_id("party_id")
+    async def party_start_custom_game(self) -> t.Mapping[str, t.Any]:
+        """
+        Party_StartCustomGame
+        Starts a custom game
+        """
+        party_id = await self._get_current_party_id()
+        data = await self.post(
+            endpoint=f"/parties/v1/parties/{party_id}/startcustomgame",
+            endpoint_type="glz",
+        )
+        return data
+
+    @retries_stale_id("party_id")
+    async def party_enter_matchmaking_queue(self) -> t.Mapping[str, t.Any]:
+        """
+        Party_EnterMatchmakingQueue
+        Enters the matchmaking queue
+        """
+        party_id = await self._get_current_party_id()
+        data = await self.post(
+            endpoint=f"/parties/v1/parties/{party_id}/matchmaking/join",
+            endpoint_type="glz",
+        )
+        return data
+
+    @retries_stale_id("party_id")
+    async def party_leave_matchmaking_queue(self) -> t.Mapping[str, t.Any]:
+        """
+        Party_LeaveMatchmakingQueue
+        Leaves the matchmaking queue
+        """
+        party_id = await self._get_current_party_id()
+        data = await self.post(
+            endpoint=f"/parties/v1/parties/{party_id}/matchmaking/leave",
+            endpoint_type="glz",
+        )
+        return data
+
+    @retries_stale_id("party_id")
+    async def set_party_accessibility(self, open: bool) -> t.Mapping[str, t.Any]:
+        """
+        Party_SetAccessibility
+        Changes the party accessibility to be open or closed
+        """
+        state = "OPEN" if open else "CLOSED"
+        party_id = await self._get_current_party_id()
+        data = await self.post(
+            endpoint=f"/parties/v1/parties/{party_id}/accessibility",
+            endpoint_type="glz",
+            json_data={"accessibility": state},
+        )
+        return data
+
+    @retries_stale_id("party_id")
+    async def party_set_custom_game_settings(self, settings: t.Mapping) -> t.Mapping[str, t.Any]:
+        """
+        Party_SetCustomGameSettings
+        Changes the settings for a custom game
+        see Client.party_set_custom_game_settings for the settings format
+        """
+        party_id = await self._get_current_party_id()
+        data = await self.post(
+            endpoint=f"/parties/v1/parties/{party_id}/customgamesettings",
+            endpoint_type="glz",
+            json_data=settings,
+        )
+        return data
+
+    @retries_stale_id("party_id")
+    async def party_invite_by_display_name(self, name: t.Text, tag: t.Text) -> t.Mapping[str, t.Any]:
+        """
+        Party_InviteToPartyByDisplayName
+        Invites a player to the party with their display name
+
+        omit the "#" in tag
+        """
+        party_id = await self._get_current_party_id()
+        data = await self.post(
+            endpoint=f"/parties/v1/parties/{party_id}/invites/name/{name}/tag/{tag}",
+            endpoint_type="glz",
+        )
+        return data
+
+    @retries_stale_id("party_id")
+    async def party_decline_request(self, request_id: t.Text) -> t.Mapping[str, t.Any]:
+        """
+        Party_DeclineRequest
+        Declines a party request
+
+        {request id}: The ID of the party request. Can be found from the Requests array on the Party_FetchParty endpoint.
+        """
+        party_id = await self._get_current_party_id()
+        data = await self.post(
+            endpoint=f"/parties/v1/parties/{party_id}/request/{request_id}/decline",
+            endpoint_type="glz",
+        )
+        return data
+
+    async def party_join(self, party_id: t.Text) -> t.Mapping[str, t.Any]:
+        """
+        Party_PlayerJoin
+        Join a party
+        """
+        data = await self.post(
+            endpoint=f"/parties/v1/players/{self.puuid}/joinparty/{party_id}",
+            endpoint_type="glz",
+        )
+        self.session_state.pop("party_id", None)
+        return data
+
+    async def party_leave(self, party_id: t.Text) -> t.Mapping[str, t.Any]:
+        """
+        Party_PlayerLeave
+        Leave a party
+        """
+        data = await self.post(
+            endpoint=f"/parties/v1/players/{self.puuid}/leaveparty/{party_id}",
+            endpoint_type="glz",
+        )
+        self.session_state.pop("party_id", None)
+        return data
+
+    @retries_stale_id("party_id")
+    async def party_fetch_muc_token(self) -> t.Mapping[str, t.Any]:
+        """
+        Party_FetchMUCToken
+        Get a token for party chat
+        """
+        party_id = await self._get_current_party_id()
+        data = await self.fetch(
+            endpoint=f"/parties/v1/parties/{party_id}/muctoken", endpoint_type="glz"
+        )
+        return data
+
+    @retries_stale_id("party_id")
+    async def party_fetch_voice_token(self) -> t.Mapping[str, t.Any]:
+        """
+        Party_FetchVoiceToken
+        Get a token for party voice
+        """
+        party_id = await self._get_current_party_id()
+        data = await self.fetch(
+            endpoint=f"/parties/v1/parties/{party_id}/voicetoken", endpoint_type="glz"
+        )
+        return data
+
+    # live game endpoints
+    async def coregame_fetch_player(self) -> t.Mapping[str, t.Any]:
+        """
+        CoreGame_FetchPlayer
+        Get the game ID for an ongoing game the player is in
+        """
+        data = await self.fetch(
+            endpoint=f"/core-game/v1/players/{self.puuid}",
+            endpoint_type="glz",
+            exceptions={404: [PhaseError, "You are not in a core-game"]},
+        )
+        self._remember_match_id("coregame", data["MatchID"])
+        return data
+
+    @retries_stale_id("coregame_match_id")
+    async def coregame_fetch_match(self, match_id: t.Optional[t.Text] = None) -> t.Mapping[str, t.Any]:
+        """
+        CoreGame_FetchMatch
+        Get information about an ongoing game
+        """
+        match_id = await self._coregame_check_match_id(match_id)
+        data = await self.fetch(
+            endpoint=f"/core-game/v1/matches/{match_id}",
+            endpoint_type="glz",
+            exceptions={404: [PhaseError, "You are not in a core-game"]},
+        )
+        if data.get("State", "IN_PROGRESS") != "IN_PROGRESS":
+            # the match is over, so the next call has to look up the new one
+            self._forget_match_id("coregame", match_id)
+        return data
+
+    @retries_stale_id("coregame_match_id")
+    async def coregame_fetch_match_loadouts(self, match_id: t.Optional[t.Text] = None) -> t.Mapping[str, t.Any]:
+        """
+        CoreGame_FetchMatchLoadouts
+        Get player skins and sprays for an ongoing game
+        """
+        match_id = await self._coregame_check_match_id(match_id)
+        data = await self.fetch(
+            endpoint=f"/core-game/v1/matches/{match_id}/loadouts",
+            endpoint_type="glz",
+            exceptions={404: [PhaseError, "You are not in a core-game"]},
+        )
+        return data
+
+    @retries_stale_id("coregame_match_id")
+    async def coregame_fetch_team_chat_muc_token(self, match_id: t.Optional[t.Text] = None) -> t.Mapping[str, t.Any]:
+        """
+        CoreGame_FetchTeamChatMUCToken
+        Get a token for team chat
+        """
+        match_id = await self._coregame_check_match_id(match_id)
+        data = await self.fetch(
+            endpoint=f"/core-game/v1/matches/{match_id}/teamchatmuctoken",
+            endpoint_type="glz",
+            exceptions={404: [PhaseError, "You are not in a core-game"]},
+        )
+        return data
+
+    @retries_stale_id("coregame_match_id")
+    async def coregame_fetch_allchat_muc_token(self, match_id: t.Optional[t.Text] = None) -> t.Mapping[str, t.Any]:
+        """
+        CoreGame_FetchAllChatMUCToken
+        Get a token for all chat
+        """
+        match_id = await self._coregame_check_match_id(match_id)
+        data = await self.fetch(
+            endpoint=f"/core-game/v1/matches/{match_id}/allchatmuctoken",
+            endpoint_type="glz",
+            exceptions={404: [PhaseError, "You are not in a core-game"]},
+        )
+        return data
+
+    @retries_stale_id("coregame_match_id")
+    async def coregame_disassociate_player(self, match_id: t.Optional[t.Text] = None) -> t.Mapping[str, t.Any]:
+        """
+        CoreGame_DisassociatePlayer
+        Leave an in-progress game
+        """
+        match_id = await self._coregame_check_match_id(match_id)
+        data = await self.fetch(
+            endpoint=f"/core-game/v1/players/{self.puuid}/disassociate/{match_id}",
+            endpoint_type="glz",
+            exceptions={404: [PhaseError, "You are not in a core-game"]},
+        )
+        self._forget_match_id("coregame", match_id)
+        return data
+
+    # pregame endpoints
+    async def pregame_fetch_player(self) -> t.Mapping[str, t.Any]:
+        """
+        Pregame_GetPlayer
+        Get the ID of a game in the pre-game stage
+        """
+        data = await self.fetch(
+            endpoint=f"/pregame/v1/players/{self.puuid}",
+            endpoint_type="glz",
+            exceptions={404: [PhaseError, "You are not in a pre-game"]},
+        )
+        self._remember_match_id("pregame", data["MatchID"])
+        return data
+
+    @retries_stale_id("pregame_match_id")
+    async def pregame_fetch_match(self, match_id: t.Optional[t.Text] = None) -> t.Mapping[str, t.Any]:
+        """
+        Pregame_GetMatch
+        Get info for a game in the pre-game stage
+        """
+        match_id = await self._pregame_check_match_id(match_id)
+        data = await self.fetch(
+            endpoint=f"/pregame/v1/matches/{match_id}",
+            endpoint_type="glz",
+            exceptions={404: [PhaseError, "You are not in a pre-game"]},
+        )
+        return data
+
+    @retries_stale_id("pregame_match_id")
+    async def pregame_fetch_match_loadouts(self, match_id: t.Optional[t.Text] = None) -> t.Mapping[str, t.Any]:
+        """
+        Pregame_GetMatchLoadouts
+        Get player skins and sprays for a game in the pre-game stage
+        """
+        match_id = await self._pregame_check_match_id(match_id)
+        data = await self.fetch(
+            endpoint=f"/pregame/v1/matches/{match_id}/loadouts",
+            endpoint_type="glz",
+            exceptions={404: [PhaseError, "You are not in a pre-game"]},
+        )
+        return data
+
+    @retries_stale_id("pregame_match_id")
+    async def pregame_fetch_chat_token(self, match_id: t.Optional[t.Text] = None) -> t.Mapping[str, t.Any]:
+        """
+        Pregame_FetchChatToken
+        Get a chat token
+        """
+        match_id = await self._pregame_check_match_id(match_id)
+        data = await self.fetch(
+            endpoint=f"/pregame/v1/matches/{match_id}/chattoken",
+            endpoint_type="glz",
+            exceptions={404: [PhaseError, "You are not in a pre-game"]},
+        )
+        return data
+
+    @retries_stale_id("pregame_match_id")
+    async def pregame_fetch_voice_token(self, match_id: t.Optional[t.Text] = None) -> t.Mapping[str, t.Any]:
+        """
+        Pregame_FetchVoiceToken
+        Get a voice token
+        """
+        match_id = await self._pregame_check_match_id(match_id)
+        data = await self.fetch(
+            endpoint=f"/pregame/v1/matches/{match_id}/voicetoken",
+            endpoint_type="glz",
+            exceptions={404: [PhaseError, "You are not in a pre-game"]},
+        )
+        return data
+
+    @retries_stale_id("pregame_match_id")
+    async def pregame_select_character(self, agent_id: t.Text, match_id: t.Optional[t.Text] = None) -> t.Mapping[str, t.Any]:
+        """
+        Pregame_SelectCharacter
+        Select an agent
+
+        don't use this for instalocking :)
+        """
+        match_id = await self._pregame_check_match_id(match_id)
+        data = await self.post(
+            endpoint=f"/pregame/v1/matches/{match_id}/select/{agent_id}",
+            endpoint_type="glz",
+            exceptions={404: [PhaseError, "You are not in a pre-game"]},
+        )
+        return data
+
+    @retries_stale_id("pregame_match_id")
+    async def pregame_lock_character(self, agent_id: t.Text, match_id: t.Optional[t.Text] = None) -> t.Mapping[str, t.Any]:
+        """
+        Pregame_LockCharacter
+        Lock in an agent
+
+        don't use this for instalocking :)
+        """
+        match_id = await self._pregame_check_match_id(match_id)
+        data = await self.post(
+            endpoint=f"/pregame/v1/matches/{match_id}/lock/{agent_id}",
+            endpoint_type="glz",
+            exceptions={404: [PhaseError, "You are not in a pre-game"]},
+        )
+        return data
+
+    @retries_stale_id("pregame_match_id")
+    async def pregame_quit_match(self, match_id: t.Optional[t.Text] = None) -> t.Mapping[str, t.Any]:
+        """
+        Pregame_QuitMatch
+        Quit a match in the pre-game stage
+        """
+        match_id = await self._pregame_check_match_id(match_id)
+        data = await self.post(
+            endpoint=f"/pregame/v1/matches/{match_id}/quit",
+            endpoint_type="glz",
+            exceptions={404: [PhaseError, "You are not in a pre-game"]},
+        )
+        self._forget_match_id("pregame", match_id)
+        return data
+
+    # local riotclient endpoints
+    async def fetch_presence(self, puuid: t.Optional[t.Text] = None) -> t.Mapping[str, t.Any]:
+        """
+        PRESENCE_RNet_GET
+        NOTE: Only works on self or active user's friends
+        """
+        puuid = self._check_puuid(puuid)
+        return (await self.fetch_presence_snapshot()).private(puuid)
+
+    async def fetch_presences(self, puuids: t.Iterable[t.Text]) -> t.Mapping[str, t.Any]:
+        """
+        PRESENCE_RNet_GET for many players with a single download
+        Returns {puuid: decoded private presence or None}
+        NOTE: Only works on self or active user's friends
+        """
+        snapshot = await self.fetch_presence_snapshot()
+        return {puuid: snapshot.private(puuid) for puuid in puuids}
+
+    async def fetch_presence_snapshot(self) -> PresenceSnapshot:
+        """
+        PRESENCE_RNet_GET_ALL
+        Get every presence indexed by puuid; private blobs are only decoded when they're read
+        """
+        data = await self.fetch(endpoint="/chat/v4/presences", endpoint_type="local")
+        return PresenceSnapshot(data)
+
+    # local utility functions
+    async def _iter_pages(self, fetch_page, key, page_size) -> t.AsyncIterator[t.Mapping[str, t.Any]]:
+        """Yield the items under key from consecutive pages, prefetching the next page while the current one is consumed"""
+        start = 0
+        task = asyncio.ensure_future(fetch_page(start))
+        try:
+            while task is not None:
+                page = await task
+                items = page.get(key) or []
+                total = page.get("Total")  # competitive updates don't report a total
+                start += page_size
+                if len(items) >= page_size and (total is None or start < total):
+                    task = asyncio.ensure_future(fetch_page(start))
+                else:
+                    task = None
+                for item in items:
+                    yield item
+        finally:
+            # an abandoned prefetch would otherwise keep using (or re-open) the session after the caller closes it
+            if task is not None:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+
+    async def _get_live_season(self) -> str:
+        """Get the UUID of the live competitive season"""
+        return (await self.fetch_mmr())["LatestCompetitiveUpdate"]["SeasonID"]
+
+    async def _get_current_party_id(self) -> str:
+        """Get the user's current party ID"""
+        if "party_id" in self.session_state:
+            return self.session_state["party_id"]
+        party = await self.party_fetch_player()
+        return party["CurrentPartyID"]
+
+    async def _coregame_check_match_id(self, match_id) -> str:
+        """Check if a match id was passed into the method"""
+        if match_id is not None:
+            return match_id
+        if "coregame_match_id" in self.session_state:
+            return self.session_state["coregame_match_id"]
+        return (await self.coregame_fetch_player())["MatchID"]
+
+    async def _pregame_check_match_id(self, match_id) -> str:
+        if match_id is not None:
+            return match_id
+        if "pregame_match_id" in self.session_state:
+            return self.session_state["pregame_match_id"]
+        return (await self.pregame_fetch_player())["MatchID"]
+
+    def _get_http_session(self):
+        """Get the aiohttp session, creating it inside the running event loop on first use"""
+        if self.closed:
+            raise RuntimeError("The client is closed")
+        if self.http_session is None or self.http_session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.connection_limit,
+                limit_per_host=self.connection_limit_per_host,
+            )
+            self.http_session = aiohttp.ClientSession(connector=connector)
+        return self.http_session
+
+    async def _refresh_tokens(self) -> t.Optional[float]:
+        """Get new tokens and return when they expire; called by the token manager"""
+        self.puuid, self.headers, self.local_headers = await self._get_headers()
+        if self.auth is None:
+            return token_expiry(self.headers)
+        return self.auth.expires_at
+
+    async def _get_headers(self) -> t.Tuple[t.Text, t.Mapping[t.Text, t.Any]]:
+        """Get authorization headers to make requests"""
+        try:
+            if self.auth is None:
+                return await self._get_auth_headers()
+            # Auth is built on requests, so run the handshake off the event loop
+            loop = asyncio.get_running_loop()
+            puuid, headers, _ = await loop.run_in_executor(None, self.auth.authenticate)
+            headers["X-Riot-ClientPlatform"] = self.client_platform
+            headers["X-Riot-ClientVersion"] = await self._get_current_version()
+            return puuid, headers, None
+
+        except Exception as e:
+            raise HandshakeError("Unable to get headers; is VALORANT running?") from e
+
+    async def _get_auth_headers(self) -> t.Tuple[t.Text, t.Mapping[t.Text, t.Any]]:
+        local_headers = self._build_local_headers()
+        # the entitlements token and the client version don't depend on each other
+        entitlements, version = await asyncio.gather(
+            self._get_entitlements(local_headers), self._get_current_version()
+        )
+        puuid = entitlements["subject"]
+        headers = self._build_headers(entitlements, version)
+        return puuid, headers, local_headers
+
+    async def _get_entitlements(self, local_headers) -> t.Mapping[t.Text, t.Any]:
+        session = self._get_http_session()
+        async with session.get(
+            f"{self._get_base_url('local')}/entitlements/v1/token",
+            headers=local_headers,
+            ssl=False,
+        ) as response:
+            return await response.json(content_type=None)
+
+    async def _get_current_version(self) -> str:
+        version = self.version_cache.current()
+        if version is None:
+            version = await self._fetch_current_version()
+            self.version_cache.set(version)
+        elif self.version_cache.stale() and self.version_cache.begin_revalidation():
+            asyncio.ensure_future(self._revalidate_version())
+        return version
+
+    async def _revalidate_version(self) -> None:
+        try:
+            self.version_cache.set(await self._fetch_current_version())
+        except:  # keep serving the old version, try again on the next lookup
+            self.version_cache.end_revalidation()
+
+    async def _fetch_current_version(self) -> str:
+        session = self._get_http_session()
+        async with session.get("https://valorant-api.com/v1/version") as response:
+            data = await response.json(content_type=None)
+        return self._format_version(data["data"])
@@ -1,48 +1,140 @@
 import requests
+import json
+import os
 import re
+import time
+from urllib.parse import urlencode
+
+from .tokens import jwt_expiry
+from .exceptions import HandshakeError
+
+authorization_params = {
+    "client_id": "play-valorant-web-prod",
+    "nonce": "1",
+    "redirect_uri": "https://playvalorant.com/opt_in",
+    "response_type": "token id_token",
+}
+authorize_url = "https://auth.riotgames.com/authorize?" + urlencode(authorization_params)
 
 
 class Auth:
-    def __init__(self, auth):
+    def __init__(self, auth, cookie_path=None):
+        """
+        auth: {"username": ..., "password": ..., "cookie_path": optional}
+        cookie_path: file the auth.riotgames.com session cookies are saved to and loaded from, so a new process
+        can re-authorize without the password (keep it private; the cookies are as good as the password)
+
+        the cookies are kept between calls to authenticate(); while they're valid a refresh is a single
+        GET to the authorize endpoint, and the full password flow only runs when that fails
+        """
         self.username = auth["username"]
         self.password = auth["password"]
+        self.cookie_path = cookie_path if cookie_path is not None else auth.get("cookie_path")
+        self.expires_at = None
+        self.user_id = None
+        self.entitlements_token = None
+        self.session = requests.session()
+        self.__load_cookies()
 
     def authenticate(self):
-        session = requests.session()
-        data = {
-            "client_id": "play-valorant-web-prod",
-            "nonce": "1",
-            "redirect_uri": "https://playvalorant.com/opt_in",
-            "response_type": "token id_token",
+        access_token = None
+        if len(self.session.cookies) > 0:
+            access_token = self.__reauthorize()
+        if access_token is None:
+            access_token = self.__login()
+        if access_token is None:
+            raise HandshakeError("Unable to authenticate; check the username and password")
+        self.__save_cookies()
+
+        headers = {
+            "Authorization": f"Bearer {access_token}",
         }
-        r = session.post("https://auth.riotgames.com/api/v1/authorization", json=data)
+        # the entitlements token and user ID outlive the access token, so only fetch them when needed
+        entitlements_expiry = jwt_expiry(self.entitlements_token) if self.entitlements_token else None
+        if entitlements_expiry is None or time.time() >= entitlements_expiry - 60:
+            r = self.session.post(
+                "https://entitlements.auth.riotgames.com/api/token/v1",
+                headers=headers,
+                json={},
+            )
+            self.entitlements_token = r.json()["entitlements_token"]
+
+        if self.user_id is None:
+            r = self.session.post(
+                "https://auth.riotgames.com/userinfo", headers=headers, json={}
+            )
+            self.user_id = r.json()["sub"]
+
+        headers["X-Riot-Entitlements-JWT"] = self.entitlements_token
+        return self.user_id, headers, {}
+
+    def close(self):
+        """Close the auth session (the saved cookie file is kept)"""
+        self.session.close()
+
+    def __reauthorize(self):
+        """Get a new access token from the session cookies; returns None if they're no longer accepted"""
+        try:
+            r = self.session.get(authorize_url, allow_redirects=False)
+        except requests.RequestException:
+            return None
+        return self.__parse_tokens(r.headers.get("Location", ""))
+
+    def __login(self):
+        """Full username/password flow"""
+        r = self.session.post("https://auth.riotgames.com/api/v1/authorization", json=authorization_params)
 
         # print(r.text)
-        data = {"type": "auth", "username": self.username, "password": self.password}
-        r = session.put("https://auth.riotgames.com/api/v1/authorization", json=data)
+        if r.json().get("type") != "response":  # a session that's still logged in skips the password step
+            data = {"type": "auth", "username": self.username, "password": self.password, "remember": True}
+            r = self.session.put("https://auth.riotgames.com/api/v1/authorization", json=data)
+        return self.__parse_tokens(r.json()["response"]["parameters"]["uri"])
+
+    def __parse_tokens(self, uri):
         pattern = re.compile(
             "access_token=((?:[a-zA-Z]|\d|\.|-|_)*).*id_token=((?:[a-zA-Z]|\d|\.|-|_)*).*expires_in=(\d*)"
         )
-        data = pattern.findall(r.json()["response"]["parameters"]["uri"])[0]
-        access_token = data[0]
-        # print('Access Token: ' + access_token)
+        found = pattern.findall(uri)
+        if len(found) == 0:
+            return None
+        data = found[0]
+        self.expires_at = time.time() + int(data[2]) if data[2] else None
+        return data[0]
 
-        headers = {
-            "Authorization": f"Bearer {access_token}",
-        }
-        r = session.post(
-            "https://entitlements.auth.riotgames.com/api/token/v1",
-            headers=headers,
-            json={},
-        )
-        entitlements_token = r.json()["entitlements_token"]
-        # print('Entitlements Token: ' + entitlements_token)
+    def __load_cookies(self):
+        if self.cookie_path is None or not os.path.exists(self.cookie_path):
+            return
+        try:
+            with open(self.cookie_path) as f:
+                cookies = json.load(f)
+        except ValueError:
+            return
+        for cookie in cookies:
+            self.session.cookies.set(
+                cookie["name"],
+                cookie["value"],
+                domain=cookie.get("domain"),
+                path=cookie.get("path", "/"),
+                expires=cookie.get("expires"),
+                secure=cookie.get("secure", False),
+            )
 
-        r = session.post(
-            "https://auth.riotgames.com/userinfo", headers=headers, json={}
-        )
-        user_id = r.json()["sub"]
-        # print('User ID: ' + user_id)
-        headers["X-Riot-Entitlements-JWT"] = entitlements_token
-        session.close()
-        return user_id, headers, {}
+    def __save_cookies(self):
+        if self.cookie_path is None:
+            return
+        cookies = [
+            {
+                "name": cookie.name,
+                "value": cookie.value,
+                "domain": cookie.domain,
+                "path": cookie.path,
+                "expires": cookie.expires,
+                "secure": cookie.secure,
+            }
+            for cookie in self.session.cookies
+        ]
+        temp_path = f"{self.cookie_path}.tmp"
+        # owner-only: the cookies can re-authorize the account
+        with open(os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w") as f:
+            json.dump(cookies, f)
+        os.replace(temp_path, self.cookie_path)
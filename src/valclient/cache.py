@@ -0,0 +1,130 @@
+import typing as t
+import time
+import threading
+from collections import OrderedDict
+
+# endpoint prefix: seconds to keep the response
+# these payloads only change when a patch goes out
+default_ttls = {
+    "/content-service/v3/content": 60 * 60,
+    "/v1/config/": 60 * 60,
+    "/store/v1/offers/": 60 * 60,
+    "/contract-definitions/v3/definitions": 60 * 60,
+    "/contract-definitions/v3/item-upgrades": 60 * 60,
+}
+
+
+def conditional_headers(response_headers: t.Mapping[t.Text, t.Text]) -> t.Mapping[t.Text, t.Text]:
+    """Turn a response's ETag/Last-Modified into the request headers that revalidate it"""
+    response_headers = {name.lower(): value for name, value in response_headers.items()}
+    validators = {}
+    if response_headers.get("etag"):
+        validators["If-None-Match"] = response_headers["etag"]
+    if response_headers.get("last-modified"):
+        validators["If-Modified-Since"] = response_headers["last-modified"]
+    return validators
+
+
+class ResponseCache:
+    def __init__(
+        self, ttls: t.Optional[t.Mapping[t.Text, float]] = None, max_size: int = 128
+    ):
+        """
+        In-memory TTL + LRU cache for GET responses, used by Client.fetch
+
+        ttls: endpoint prefix -> seconds to keep responses for; endpoints without a matching prefix are never cached
+        max_size: max number of responses kept, the least recently used one is evicted first
+
+        expired responses that came with an ETag or Last-Modified are kept (until evicted) so Client.fetch can
+        revalidate them with a conditional GET; a 304 reuses the cached body instead of downloading and decoding it again
+
+        NOTE: cached responses are returned as-is, don't mutate them
+        """
+        self.ttls = dict(default_ttls if ttls is None else ttls)
+        self.max_size = max_size
+        self.entries = OrderedDict()  # url: (expires_at, endpoint, data, conditional request headers)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.revalidations = 0
+        self.lock = threading.Lock()
+
+    def ttl_for(self, endpoint: t.Text) -> t.Optional[float]:
+        """Get the TTL for an endpoint, or None if it shouldn't be cached"""
+        path = endpoint.split("?")[0]
+        for prefix, ttl in self.ttls.items():
+            if path.startswith(prefix):
+                return ttl
+        return None
+
+    def get(self, url: t.Text) -> t.Optional[t.Any]:
+        """Get a cached response, or None if it's missing or expired"""
+        with self.lock:
+            entry = self.entries.get(url)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None and not entry[3]:
+                    del self.entries[url]
+                self.misses += 1
+                return None
+            self.entries.move_to_end(url)
+            self.hits += 1
+            return entry[2]
+
+    def set(
+        self,
+        url: t.Text,
+        endpoint: t.Text,
+        data: t.Any,
+        ttl: float,
+        validators: t.Optional[t.Mapping[t.Text, t.Text]] = None,
+    ) -> None:
+        """
+        Store a response for ttl seconds
+        validators: conditional request headers (see conditional_headers) to revalidate it with once it expires
+        """
+        with self.lock:
+            self.entries[url] = (time.monotonic() + ttl, endpoint, data, dict(validators or {}))
+            self.entries.move_to_end(url)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def stale(self, url: t.Text) -> t.Optional[t.Tuple[t.Any, t.Mapping[t.Text, t.Text]]]:
+        """Get (data, conditional request headers) for an expired response that can be revalidated, or None"""
+        with self.lock:
+            entry = self.entries.get(url)
+            if entry is None or not entry[3]:
+                return None
+            return entry[2], entry[3]
+
+    def refresh(self, url: t.Text, ttl: float) -> None:
+        """Keep a cached response for another ttl seconds after the server confirmed it's unchanged (304)"""
+        with self.lock:
+            entry = self.entries.get(url)
+            if entry is None:
+                return
+            self.entries[url] = (time.monotonic() + ttl,) + entry[1:]
+            self.entries.move_to_end(url)
+            self.revalidations += 1
+
+    def invalidate(self, endpoint: t.Optional[t.Text] = None) -> None:
+        """Drop cached responses for endpoints starting with endpoint, or everything if it's None"""
+        with self.lock:
+            if endpoint is None:
+                self.entries.clear()
+                return
+            for url in [
+                url for url, entry in self.entries.items() if entry[1].startswith(endpoint)
+            ]:
+                del self.entries[url]
+
+    def stats(self) -> t.Mapping[t.Text, int]:
+        """Get hit/miss/eviction/revalidation counts and the current size"""
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "revalidations": self.revalidations,
+                "size": len(self.entries),
+            }
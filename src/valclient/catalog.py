@@ -0,0 +1,100 @@
+import typing as t
+
+# content type names used by the catalog: keys in the fetch_content() response
+content_types = {
+    "agents": "Characters",
+    "maps": "Maps",
+    "chromas": "Chromas",
+    "skins": "Skins",
+    "skin_levels": "SkinLevels",
+    "equips": "Equips",
+    "themes": "Themes",
+    "game_modes": "GameModes",
+    "sprays": "Sprays",
+    "spray_levels": "SprayLevels",
+    "charms": "Charms",
+    "charm_levels": "CharmLevels",
+    "player_cards": "PlayerCards",
+    "player_titles": "PlayerTitles",
+    "storefront_items": "StorefrontItems",
+    "seasons": "Seasons",
+    "events": "Events",
+    "contracts": "Contracts",
+    "ceremonies": "Ceremonies",
+}
+
+
+class ContentCatalog:
+    def __init__(self, content: t.Mapping[str, t.Any], version: t.Optional[t.Text] = None):
+        """
+        Hash indexes over a fetch_content() response
+        look items up by UUID (case-insensitive) or by name (case-insensitive) in O(1)
+
+        version: client version the content was fetched for, used by Client to know when to rebuild
+        """
+        self.version = version
+        self.by_id = {}  # content type: {uuid: item}
+        self.by_name = {}  # content type: {name: item}
+        self.types = {}  # uuid: content type
+
+        for content_type, key in content_types.items():
+            ids = {}
+            names = {}
+            for item in content.get(key) or []:
+                if "ID" in item:
+                    uuid = item["ID"].lower()
+                    ids[uuid] = item
+                    self.types.setdefault(uuid, content_type)
+                if "Name" in item:
+                    names.setdefault(item["Name"].lower(), item)
+            self.by_id[content_type] = ids
+            self.by_name[content_type] = names
+
+    def __contains__(self, uuid: t.Text) -> bool:
+        return uuid.lower() in self.types
+
+    def get(self, content_type: t.Text, uuid: t.Text) -> t.Optional[t.Mapping[str, t.Any]]:
+        """Get an item of a given content type by UUID"""
+        return self.__index(self.by_id, content_type).get(uuid.lower())
+
+    def find(self, content_type: t.Text, name: t.Text) -> t.Optional[t.Mapping[str, t.Any]]:
+        """Get an item of a given content type by name"""
+        return self.__index(self.by_name, content_type).get(name.lower())
+
+    def resolve(self, uuid: t.Text) -> t.Optional[t.Mapping[str, t.Any]]:
+        """Get any item by UUID without knowing its content type"""
+        uuid = uuid.lower()
+        content_type = self.types.get(uuid)
+        if content_type is None:
+            return None
+        return self.by_id[content_type][uuid]
+
+    def type_of(self, uuid: t.Text) -> t.Optional[t.Text]:
+        """Get the content type of a UUID (agents, maps, skins, etc.)"""
+        return self.types.get(uuid.lower())
+
+    def agent(self, uuid: t.Text) -> t.Optional[t.Mapping[str, t.Any]]:
+        return self.get("agents", uuid)
+
+    def map(self, uuid: t.Text) -> t.Optional[t.Mapping[str, t.Any]]:
+        return self.get("maps", uuid)
+
+    def skin(self, uuid: t.Text) -> t.Optional[t.Mapping[str, t.Any]]:
+        return self.get("skins", uuid)
+
+    def skin_level(self, uuid: t.Text) -> t.Optional[t.Mapping[str, t.Any]]:
+        return self.get("skin_levels", uuid)
+
+    def chroma(self, uuid: t.Text) -> t.Optional[t.Mapping[str, t.Any]]:
+        return self.get("chromas", uuid)
+
+    def season(self, uuid: t.Text) -> t.Optional[t.Mapping[str, t.Any]]:
+        return self.get("seasons", uuid)
+
+    @staticmethod
+    def __index(indexes, content_type) -> t.Mapping[str, t.Any]:
+        if content_type not in indexes:
+            raise ValueError(
+                f"Invalid content type, valid types are: {list(content_types.keys())}"
+            )
+        return indexes[content_type]
@@ -5,6 +5,16 @@ import os
 import base64
 import urllib3
 import json
+import time
+import functools
+import inspect
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; it's used as the default JSON decoder when installed
+    orjson = None
 
 # imports for modules used in the package
 from .resources import regions
@@ -16,6 +26,18 @@ from .resources import base_endpoint_shared
 from .resources import queues
 
 from .auth import Auth
+from .sessions import SessionPool
+from .cache import ResponseCache, conditional_headers
+from .match_store import MatchStore
+from .watermarks import WatermarkStore
+from .catalog import ContentCatalog
+from .tokens import TokenManager, token_expiry
+from .version import VersionCache
+from .ratelimit import RequestScheduler, parse_retry_after
+from .retry import RetryPolicy
+from .presence import PresenceSnapshot
+from .events import LocalEventStream
+from .metrics import Metrics, calling_method, label_endpoints
 
 # exceptions
 from .exceptions import ResponseError, HandshakeError, LockfileError, PhaseError
@@ -24,15 +46,107 @@ from .exceptions import ResponseError, HandshakeError, LockfileError, PhaseError
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 
+# IDs dropped as stale (by a 404) during the current retries_stale_id call, see Client._expire_session_state
+expired_ids = contextvars.ContextVar("valclient_expired_ids", default=None)
+
+
+def retries_stale_id(key: t.Text):
+    """
+    For endpoint methods that fall back to a cached party/pregame/coregame ID (session_state[key]) when none is passed:
+    if the cached ID turns out to be stale (the call's own request got a 404), look the ID up again and retry once,
+    so an error only surfaces when the freshly looked-up ID fails too
+    """
+    def decorator(method):
+        signature = inspect.signature(method)
+
+        def cached_id(self, args, kwargs):
+            if "match_id" in signature.parameters:
+                if signature.bind(self, *args, **kwargs).arguments.get("match_id") is not None:
+                    return None  # an explicit ID is never retried
+            return self.session_state.get(key)
+
+        if inspect.iscoroutinefunction(method):
+            @functools.wraps(method)
+            async def retrying(self, *args, **kwargs):
+                cached = cached_id(self, args, kwargs)
+                if cached is None:
+                    return await method(self, *args, **kwargs)
+                expired = []
+                token = expired_ids.set(expired)
+                try:
+                    result = await method(self, *args, **kwargs)
+                except PhaseError:
+                    if (key, cached) not in expired:
+                        raise
+                else:
+                    if (key, cached) not in expired:
+                        return result
+                finally:
+                    expired_ids.reset(token)
+                return await method(self, *args, **kwargs)
+        else:
+            @functools.wraps(method)
+            def retrying(self, *args, **kwargs):
+                cached = cached_id(self, args, kwargs)
+                if cached is None:
+                    return method(self, *args, **kwargs)
+                expired = []
+                token = expired_ids.set(expired)
+                try:
+                    result = method(self, *args, **kwargs)
+                except PhaseError:
+                    if (key, cached) not in expired:
+                        raise
+                else:
+                    if (key, cached) not in expired:
+                        return result
+                finally:
+                    expired_ids.reset(token)
+                return method(self, *args, **kwargs)
+
+        return retrying
+
+    return decorator
+
+
+@label_endpoints
 class Client:
-    def __init__(self, region: t.Text="na", auth: t.Optional[t.Mapping]=None):
+    def __init__(
+        self,
+        region: t.Text="na",
+        auth: t.Optional[t.Mapping]=None,
+        session_pool: t.Optional[SessionPool]=None,
+        cache: t.Optional[ResponseCache]=None,
+        match_store: t.Optional[MatchStore]=None,
+        version_cache: t.Optional[VersionCache]=None,
+        client_version: t.Optional[t.Text]=None,
+        scheduler: t.Optional[RequestScheduler]=None,
+        retry_policy: t.Optional[RetryPolicy]=None,
+        metrics: t.Optional[Metrics]=None,
+        json_decoder: t.Optional[t.Callable[[bytes], t.Any]]=None,
+    ):
         """
         NOTE: when using manual auth, local endpoints will not be available
         auth format:
         {
             "username":"usernamehere",
-            "password":"passwordhere"
+            "password":"passwordhere",
+            "cookie_path":"optional; file to keep the auth cookies in so re-auth skips the password flow across restarts"
         }
+
+        session_pool: SessionPool holding the keep-alive connections for pd/glz/shared/local requests
+        pass one in to configure pool sizes or share connections between clients
+
+        cache: ResponseCache for slow-changing endpoints like content and config (disabled by default)
+        match_store: MatchStore that fetch_match_details reads finished matches from before going to pd
+        version_cache: VersionCache for the client version header (in-memory, 1 hour TTL by default)
+        client_version: pin the client version instead of looking it up on valorant-api.com
+        scheduler: RequestScheduler with per-family/shard request budgets; share one between clients on the same account
+        by default requests aren't paced, but 429 Retry-After is still honored
+        retry_policy: RetryPolicy for connection errors, timeouts, 5xx and 429 (4 attempts within 30 seconds by default;
+        writes that time out are not retried)
+        metrics: Metrics to record request counts, latency, status codes, bytes and re-auths in (disabled by default)
+        json_decoder: function that parses a raw response body (bytes); orjson.loads if orjson is installed, json.loads otherwise
         """
         if auth is None:
             self.lockfile_path = os.path.join(
@@ -48,6 +162,21 @@ class Client:
         self.region = region
         self.shard = region
         self.auth = None
+        self.session_pool = session_pool if session_pool is not None else SessionPool()
+        self.cache = cache
+        self.match_store = match_store
+        self.content_catalog = None
+        self.token_manager = TokenManager(self.__refresh_tokens)
+        self.scheduler = scheduler if scheduler is not None else RequestScheduler()
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.metrics = metrics
+        if json_decoder is None:
+            json_decoder = orjson.loads if orjson is not None else json.loads
+        self.json_decoder = json_decoder
+        self.session_state = {}  # cached party/pregame/coregame IDs, see clear_session_state
+        self.version_cache = version_cache if version_cache is not None else VersionCache()
+        if client_version is not None:
+            self.version_cache.pin(client_version)
         self.client_platform = "ew0KCSJwbGF0Zm9ybVR5cGUiOiAiUEMiLA0KCSJwbGF0Zm9ybU9TIjogIldpbmRvd3MiLA0KCSJwbGF0Zm9ybU9TVmVyc2lvbiI6ICIxMC4wLjE5MDQyLjEuMjU2LjY0Yml0IiwNCgkicGxhdGZvcm1DaGlwc2V0IjogIlVua25vd24iDQp9"
 
         if auth is not None:
@@ -64,115 +193,272 @@ class Client:
             self.region = shard_region_override[self.shard]
 
         self.base_url, self.base_url_glz, self.base_url_shared = self.__build_urls()
+        self.base_url_local = None  # overrides https://127.0.0.1:{lockfile port} when set (e.g. for a stand-in server)
 
-    def activate(self) -> None:
-        """Activate the client and get authorization"""
+    def activate(self, prewarm: bool=False) -> None:
+        """
+        Activate the client and get authorization
+        The independent handshake steps (tokens, client version, chat session) run concurrently
+        prewarm: also open connections to the pd/glz/shared servers so the first calls skip DNS/TLS setup
+        """
         try:
-            if self.auth is None:
-                self.lockfile = self.__get_lockfile()
-                self.puuid, self.headers, self.local_headers = self.__get_headers()
-
-                session = self.rnet_fetch_chat_session()
-                self.player_name = session["game_name"]
-                self.player_tag = session["game_tag"]
-            else:
-                self.puuid, self.headers, self.local_headers = self.auth.authenticate()
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                warming = executor.submit(self.prewarm) if prewarm else None
+                if self.auth is None:
+                    self.lockfile = self._get_lockfile()
+                    # the chat session only needs the lockfile, so it doesn't wait for the tokens
+                    self.local_headers = self._build_local_headers()
+                    self.session_pool.get("local")
+                    session = executor.submit(self.rnet_fetch_chat_session)
+                    self.token_manager.refresh()
+
+                    session = session.result()
+                    self.player_name = session["game_name"]
+                    self.player_tag = session["game_tag"]
+                else:
+                    self.token_manager.refresh()
+                if warming is not None:
+                    warming.result()
         except:
             raise HandshakeError("Unable to activate; is VALORANT running?")
 
+    def prewarm(self, timeout: float=5) -> None:
+        """Open a pooled connection to each of the pd/glz/shared servers; failures are ignored"""
+        self.session_pool.prewarm(
+            {
+                "pd": self.base_url,
+                "glz": self.base_url_glz,
+                "shared": self.base_url_shared,
+            },
+            timeout=timeout,
+        )
+
+    def close(self) -> None:
+        """Close the pooled connections held by the client"""
+        self.session_pool.close()
+        if self.auth is not None:
+            self.auth.close()
+
+    def invalidate_cache(self, endpoint: t.Optional[t.Text]=None) -> None:
+        """Drop cached responses for endpoints starting with endpoint, or all of them if it's None"""
+        if self.cache is not None:
+            self.cache.invalidate(endpoint)
+
+    def clear_session_state(self) -> None:
+        """
+        Forget the cached party ID and pregame/coregame match IDs
+        They're also dropped automatically when a party/pregame/coregame endpoint returns 404 or the phase changes
+        """
+        self.session_state = {}
+
+    def export_state(self, path: t.Optional[t.Text]=None) -> t.Mapping[str, t.Any]:
+        """
+        Snapshot the activated client's identity and tokens so another process can skip activate() (see from_state)
+        path: also write the snapshot to this file (owner-only; it holds live tokens)
+        """
+        state = {
+            "format": 1,
+            "saved_at": time.time(),
+            # the region to construct with; pbe maps its region to na, so it's only recoverable from the shard
+            "region": self.shard if self.shard in shard_region_override else self.region,
+            "shard": self.shard,
+            "puuid": self.puuid,
+            "player_name": self.player_name,
+            "player_tag": self.player_tag,
+            # the auth account the tokens belong to (None for lockfile clients)
+            "username": self.auth.username if self.auth is not None else None,
+            "headers": dict(self.headers),
+            "local_headers": dict(self.local_headers or {}),
+            "lockfile": dict(self.lockfile),
+            "client_version": self.headers.get("X-Riot-ClientVersion"),
+            # when the version was fetched, so a restored client revalidates it on the usual schedule
+            "client_version_fetched_at": (
+                self.version_cache.fetched_at
+                if self.version_cache.version == self.headers.get("X-Riot-ClientVersion")
+                else 0
+            ),
+            "expires_at": self.token_manager.expires_at,
+        }
+        if path is not None:
+            temp_path = f"{path}.tmp"
+            with open(os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w") as f:
+                json.dump(state, f)
+            os.replace(temp_path, path)
+        return state
+
+    @classmethod
+    def from_state(cls, state: t.Union[t.Mapping[str, t.Any], t.Text], **kwargs) -> "Client":
+        """
+        Build a client from export_state() output (or the file it was saved to)
+        kwargs are passed to the constructor (pass the same auth for clients using manual auth)
+
+        the snapshot is only used if its tokens are valid for longer than the token manager's refresh margin,
+        it was taken for the same auth account and (for lockfile clients) the Riot client hasn't restarted since;
+        otherwise, or if the file is missing or unreadable, the client activates normally
+        """
+        state = cls._load_state(state)
+        if state is not None:
+            kwargs.setdefault("region", state["region"])
+        client = cls(**kwargs)
+        if state is None or not client._restore_state(state):
+            client.activate()
+        return client
+
+    @staticmethod
+    def _load_state(state) -> t.Optional[t.Mapping[str, t.Any]]:
+        """Read a snapshot file for from_state; None if there isn't a usable one (e.g. on first boot)"""
+        if not isinstance(state, str):
+            return state
+        try:
+            with open(state) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return state if isinstance(state, dict) and "region" in state else None
+
+    def _restore_state(self, state) -> bool:
+        """Apply a snapshot from export_state; returns False (leaving the client untouched) if it's stale"""
+        expires_at = state.get("expires_at")
+        if state.get("format") != 1 or state.get("shard") != self.shard:
+            return False
+        if expires_at is None or time.time() >= expires_at - self.token_manager.refresh_margin:
+            return False
+        if state.get("username") != (self.auth.username if self.auth is not None else None):
+            return False  # the tokens belong to another account
+        if self.auth is None:
+            try:
+                lockfile = self._get_lockfile()
+            except LockfileError:
+                return False
+            if lockfile != state.get("lockfile"):
+                return False  # the Riot client restarted, so the local password and tokens changed
+
+        self.puuid = state["puuid"]
+        self.player_name = state["player_name"]
+        self.player_tag = state["player_tag"]
+        self.headers = dict(state["headers"])
+        self.local_headers = dict(state["local_headers"])
+        self.lockfile = dict(state["lockfile"])
+        self.token_manager.expires_at = expires_at
+        if state.get("client_version"):
+            # older snapshots don't say when the version was fetched; treat it as stale so it's revalidated
+            self.version_cache.restore(state["client_version"], state.get("client_version_fetched_at", 0))
+        if self.auth is not None:
+            self.auth.expires_at = expires_at
+            self.auth.user_id = self.puuid
+            self.auth.entitlements_token = self.headers.get("X-Riot-Entitlements-JWT")
+        return True
+
     @staticmethod
     def fetch_regions() -> t.List:
         """Fetch valid regions"""
         return regions
 
-    def __verify_status_code(self, status_code, exceptions={}):
+    def _verify_status_code(self, status_code, exceptions={}):
         """Verify that the request was successful according to exceptions"""
         if status_code in exceptions.keys():
             response_exception = exceptions[status_code]
             raise response_exception[0](response_exception[1])
 
     def fetch(
-        self, endpoint="/", endpoint_type="pd", exceptions={}
+        self, endpoint="/", endpoint_type="pd", exceptions={}, raw=False
     ) -> dict:  # exception: code: {Exception, Message}
-        """Get data from a pd/glz/local endpoint"""
+        """
+        Get data from a pd/glz/local endpoint
+        raw: return the undecoded response body (bytes) instead; raw responses aren't cached
+        """
+        ttl = None
+        if self.cache is not None and endpoint_type != "local" and not raw:
+            ttl = self.cache.ttl_for(endpoint)
+        if ttl is not None:
+            url = f"{self._get_base_url(endpoint_type)}{endpoint}"
+            data = self.cache.get(url)
+            if data is None:
+                data = self.__fetch(endpoint, endpoint_type, exceptions, cache_entry=(url, ttl))
+            return data
+        return self.__fetch(endpoint, endpoint_type, exceptions, raw=raw)
+
+    def __fetch(self, endpoint, endpoint_type, exceptions, refresh_on_400=True, raw=False, cache_entry=None) -> dict:
         data = None
         if endpoint_type in ["pd", "glz", "shared"]:
-            response = requests.get(
-                f'{self.base_url_glz if endpoint_type == "glz" else self.base_url if endpoint_type == "pd" else self.base_url_shared if endpoint_type == "shared" else self.base_url}{endpoint}',
-                headers=self.headers,
-            )
-
-            # custom exceptions for http status codes
-            self.__verify_status_code(response.status_code, exceptions)
-
-            try:
-                data = json.loads(response.text)
-            except:  # as no data is set, an exception will be raised later in the method
-                pass
+            self.token_manager.ensure_fresh()
+        generation = self.token_manager.generation
+        # an expired cached response with an ETag/Last-Modified is revalidated instead of downloaded again
+        stale = self.cache.stale(cache_entry[0]) if cache_entry is not None else None
+        response = self._send("GET", endpoint, endpoint_type, headers=stale[1] if stale is not None else None)
 
-        elif endpoint_type == "local":
-            response = requests.get(
-                "https://127.0.0.1:{port}{endpoint}".format(
-                    port=self.lockfile["port"], endpoint=endpoint
-                ),
-                headers=self.local_headers,
-                verify=False,
-            )
+        # custom exceptions for http status codes
+        self._verify_status_code(response.status_code, exceptions)
 
-            # custom exceptions for http status codes
-            self.__verify_status_code(response.status_code, exceptions)
+        if stale is not None and response.status_code == 304:
+            self.cache.refresh(*cache_entry)
+            return stale[0]
 
+        if raw:
+            rejected = response.status_code == 400
+        else:
             try:
-                data = response.json()
+                data = self.json_decoder(response.content)
             except:  # as no data is set, an exception will be raised later in the method
                 pass
 
-        if data is None:
-            raise ResponseError("Request returned NoneType")
-
-        if "httpStatus" not in data:
-            return data
-        if data["httpStatus"] == 400:
-            # if headers expire (i dont think they ever do but jic), refresh em!
-            if self.auth is None:
-                self.puuid, self.headers, self.local_headers = self.__get_headers()
-            else:
-                self.puuid, self.headers, self.local_headers = self.auth.authenticate()
-            return self.fetch(endpoint=endpoint, endpoint_type=endpoint_type)
+            if data is None:
+                raise ResponseError("Request returned NoneType")
+
+            if "httpStatus" not in data:
+                if cache_entry is not None:
+                    url, ttl = cache_entry
+                    self.cache.set(url, endpoint, data, ttl, validators=conditional_headers(response.headers))
+                return data
+            rejected = data["httpStatus"] == 400
+
+        if rejected and refresh_on_400:
+            # tokens were rejected; refresh once (or wait for a refresh already in flight) and retry
+            if self.metrics is not None:
+                self.metrics.observe_reauth(endpoint_type, calling_method("fetch"))
+            self.token_manager.refresh(generation)
+            return self.__fetch(
+                endpoint, endpoint_type, exceptions, refresh_on_400=False, raw=raw, cache_entry=cache_entry
+            )
+        if raw:
+            return response.content
 
     def post(
-        self, endpoint="/", endpoint_type="pd", json_data={}, exceptions={}
+        self, endpoint="/", endpoint_type="pd", json_data={}, exceptions={}, raw=False
     ) -> dict:
-        """Post data to a pd/glz endpoint"""
+        """
+        Post data to a pd/glz endpoint
+        raw: return the undecoded response body (bytes)
+        """
         data = None
-        response = requests.post(
-            f'{self.base_url_glz if endpoint_type == "glz" else self.base_url}{endpoint}',
-            headers=self.headers,
-            json=json_data,
-        )
+        self.token_manager.ensure_fresh()
+        response = self._send("POST", endpoint, endpoint_type, json=json_data)
 
         # custom exceptions for http status codes
-        self.__verify_status_code(response.status_code, exceptions)
+        self._verify_status_code(response.status_code, exceptions)
+
+        if raw:
+            return response.content
 
         try:
-            data = json.loads(response.text)
+            data = self.json_decoder(response.content)
         except:
             data = None
 
         return data
 
     def put(
-        self, endpoint="/", endpoint_type="pd", json_data={}, exceptions={}
+        self, endpoint="/", endpoint_type="pd", json_data={}, exceptions={}, raw=False
     ) -> dict:
-        response = requests.put(
-            f'{self.base_url_glz if endpoint_type == "glz" else self.base_url}{endpoint}',
-            headers=self.headers,
-            data=json.dumps(json_data),
-        )
-        data = json.loads(response.text)
+        self.token_manager.ensure_fresh()
+        response = self._send("PUT", endpoint, endpoint_type, data=json.dumps(json_data))
 
         # custom exceptions for http status codes
-        self.__verify_status_code(response.status_code, exceptions)
+        self._verify_status_code(response.status_code, exceptions)
+
+        if raw:
+            return response.content
+        data = self.json_decoder(response.content)
 
         if data is not None:
             return data
@@ -180,23 +466,106 @@ class Client:
             raise ResponseError("Request returned NoneType")
 
     def delete(
-        self, endpoint="/", endpoint_type="pd", json_data={}, exceptions={}
+        self, endpoint="/", endpoint_type="pd", json_data={}, exceptions={}, raw=False
     ) -> dict:
-        response = requests.delete(
-            f'{self.base_url_glz if endpoint_type == "glz" else self.base_url}{endpoint}',
-            headers=self.headers,
-            data=json.dumps(json_data),
-        )
-        data = json.loads(response.text)
+        self.token_manager.ensure_fresh()
+        response = self._send("DELETE", endpoint, endpoint_type, data=json.dumps(json_data))
 
         # custom exceptions for http status codes
-        self.__verify_status_code(response.status_code, exceptions)
+        self._verify_status_code(response.status_code, exceptions)
+
+        if raw:
+            return response.content
+        data = self.json_decoder(response.content)
 
         if data is not None:
             return data
         else:
             raise ResponseError("Request returned NoneType")
 
+    def _send(self, method, endpoint, endpoint_type, headers=None, **kwargs) -> requests.Response:
+        """
+        Send a request through the endpoint family's pooled session
+        headers: extra request headers on top of the client's auth headers
+        Waits for the scheduler before every attempt and retries transient failures according to the retry policy;
+        a 429 holds the whole family for its Retry-After
+        """
+        policy = self.retry_policy
+        method_name = None
+        if self.metrics is not None:
+            method_name = calling_method(method.lower())
+        local_headers, auth_headers = self.local_headers, self.headers
+        if headers:
+            local_headers, auth_headers = {**(local_headers or {}), **headers}, {**auth_headers, **headers}
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            self.scheduler.acquire(endpoint_type, self.shard)
+            response = None
+            error = None
+            sent_at = time.monotonic()
+            try:
+                if endpoint_type == "local":
+                    response = self.session_pool.get("local").request(
+                        method,
+                        f"{self._get_base_url('local')}{endpoint}",
+                        headers=local_headers,
+                        verify=False,
+                        timeout=policy.timeout,
+                        **kwargs,
+                    )
+                else:
+                    response = self.session_pool.get(endpoint_type).request(
+                        method,
+                        f"{self._get_base_url(endpoint_type)}{endpoint}",
+                        headers=auth_headers,
+                        timeout=policy.timeout,
+                        **kwargs,
+                    )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+
+            status = response.status_code if response is not None else None
+            if self.metrics is not None:
+                self.metrics.observe(
+                    endpoint_type,
+                    method_name,
+                    status,
+                    time.monotonic() - sent_at,
+                    bytes_in=len(response.content) if response is not None else 0,
+                    bytes_out=len(response.request.body or b"") if response is not None else 0,
+                )
+            retry_after = None
+            if status == 429:
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            elapsed = time.monotonic() - started
+            # a read timeout (unlike a connect timeout) may come after the server got the request
+            timed_out = isinstance(error, requests.Timeout) and not isinstance(error, requests.ConnectTimeout)
+            delay = policy.next_delay(attempt, elapsed, status, error, retry_after, method, timed_out)
+            policy.report(
+                method=method,
+                endpoint=endpoint,
+                endpoint_type=endpoint_type,
+                attempt=attempt,
+                status=status,
+                error=error,
+                elapsed=elapsed,
+                delay=delay,
+            )
+            if delay is None:
+                break
+            if status == 429:
+                # the scheduler makes every request to this family wait, including the retry
+                self.scheduler.penalize(endpoint_type, self.shard, delay)
+            else:
+                time.sleep(delay)
+
+        if error is not None:
+            raise error
+        self._expire_session_state(endpoint, response.status_code)
+        return response
+
     # --------------------------------------------------------------------------------------------------
 
     # PVP endpoints
@@ -210,6 +579,16 @@ class Client:
         )
         return data
 
+    def fetch_content_catalog(self) -> ContentCatalog:
+        """
+        Get a ContentCatalog built from fetch_content() for UUID/name lookups
+        The catalog is kept until the client version changes
+        """
+        version = self.headers.get("X-Riot-ClientVersion")
+        if self.content_catalog is None or self.content_catalog.version != version:
+            self.content_catalog = ContentCatalog(self.fetch_content(), version=version)
+        return self.content_catalog
+
     def fetch_account_xp(self) -> t.Mapping[str, t.Any]:
         """
         AccountXP_GetPlayer
@@ -248,7 +627,7 @@ class Client:
         MMR_FetchPlayer
         Get the match making rating for a player
         """
-        puuid = self.__check_puuid(puuid)
+        puuid = self._check_puuid(puuid)
         data = self.fetch(endpoint=f"/mmr/v1/players/{puuid}", endpoint_type="pd")
         return data
 
@@ -264,8 +643,8 @@ class Client:
         Get recent matches for a player
         There are 3 optional query parameters: start_index, end_index, and queue_id. queue can be one of null, competitive, custom, deathmatch, ggteam, newmap, onefa, snowball, spikerush, or unrated.
         """
-        self.__check_queue_type(queue_id)
-        puuid = self.__check_puuid(puuid)
+        self._check_queue_type(queue_id)
+        puuid = self._check_puuid(puuid)
         data = self.fetch(
             endpoint=f"/match-history/v1/history/{puuid}?startIndex={start_index}&endIndex={end_index}"
             + (f"&queue={queue_id}" if queue_id != "null" else ""),
@@ -277,12 +656,44 @@ class Client:
         """
         Get the full info for a previous match
         Includes everything that the in-game match details screen shows including damage and kill positions, same as the official API w/ a production key
+        If the client has a match_store, finished matches are read from/saved to it
         """
+        if self.match_store is not None:
+            data = self.match_store.get(match_id)
+            if data is not None:
+                return data
         data = self.fetch(
             endpoint=f"/match-details/v1/matches/{match_id}", endpoint_type="pd"
         )
+        if self.match_store is not None and MatchStore.is_complete(data):
+            self.match_store.put(match_id, data)
         return data
 
+    def preload_match_details(self, match_ids: t.Iterable[t.Text], max_workers: int = 4) -> int:
+        """
+        Download every match in match_ids that isn't in the client's match_store yet
+        Returns the number of matches that were downloaded
+        """
+        if self.match_store is None:
+            raise ValueError("preload_match_details requires a match_store")
+        missing = self.match_store.missing(match_ids)
+
+        def download(match_id):
+            return match_id, self.fetch(
+                endpoint=f"/match-details/v1/matches/{match_id}", endpoint_type="pd"
+            )
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # run each download in a copy of the caller's context so RequestScheduler.background() carries over
+            downloads = [executor.submit(contextvars.copy_context().run, download, match_id) for match_id in missing]
+            matches = {
+                match_id: data
+                for match_id, data in (future.result() for future in downloads)
+                if MatchStore.is_complete(data)
+            }
+        self.match_store.put_many(matches)
+        return len(matches)
+
     def fetch_competitive_updates(
         self,
         puuid: t.Optional[t.Text] = None,
@@ -295,8 +706,8 @@ class Client:
         Get recent games and how they changed ranking
         There are 3 optional query parameters: start_index, end_index, and queue_id. queue can be one of null, competitive, custom, deathmatch, ggteam, newmap, onefa, snowball, spikerush, or unrated.
         """
-        self.__check_queue_type(queue_id)
-        puuid = self.__check_puuid(puuid)
+        self._check_queue_type(queue_id)
+        puuid = self._check_puuid(puuid)
         data = self.fetch(
             endpoint=f"/mmr/v1/players/{puuid}/competitiveupdates?startIndex={start_index}&endIndex={end_index}"
             + (f"&queue={queue_id}" if queue_id != "" else ""),
@@ -304,6 +715,90 @@ class Client:
         )
         return data
 
+    def iter_match_history(
+        self,
+        puuid: t.Optional[t.Text] = None,
+        queue_id: t.Text = "null",
+        page_size: int = 20,
+    ) -> t.Iterator[t.Mapping[str, t.Any]]:
+        """
+        Iterate over a player's whole match history, newest first
+        Pages are requested page_size matches at a time; the next page is fetched in the background while the current one is consumed
+        """
+        self._check_queue_type(queue_id)
+        puuid = self._check_puuid(puuid)
+        return self._iter_pages(
+            lambda start: self.fetch_match_history(
+                puuid, start_index=start, end_index=start + page_size, queue_id=queue_id
+            ),
+            "History",
+            page_size,
+        )
+
+    def sync_match_history(
+        self,
+        watermarks: WatermarkStore,
+        puuid: t.Optional[t.Text] = None,
+        queue_id: t.Text = "null",
+        page_size: int = 20,
+    ) -> t.List[t.Mapping[str, t.Any]]:
+        """
+        Get the matches a player has played since the last sync, newest first
+        Pages are fetched only until the newest match from the previous sync (the watermark) is reached, then the watermark is moved up
+        The first sync for a player returns their whole history
+        """
+        self._check_queue_type(queue_id)
+        puuid = self._check_puuid(puuid)
+        key = puuid if queue_id == "null" else f"{puuid}:{queue_id}"
+        watermark = watermarks.get(key)
+
+        new_matches = []
+        start = 0
+        while True:
+            page = self.fetch_match_history(
+                puuid, start_index=start, end_index=start + page_size, queue_id=queue_id
+            )
+            history = page.get("History") or []
+            for match in history:
+                if watermark is not None and self._reached_watermark(match, watermark):
+                    break
+                new_matches.append(match)
+            else:
+                start += page_size
+                if len(history) >= page_size and start < page.get("Total", 0):
+                    continue
+            break
+
+        if len(new_matches) > 0:
+            watermarks.set(
+                key,
+                {
+                    "MatchID": new_matches[0]["MatchID"],
+                    "GameStartTime": new_matches[0]["GameStartTime"],
+                },
+            )
+        return new_matches
+
+    def iter_competitive_updates(
+        self,
+        puuid: t.Optional[t.Text] = None,
+        queue_id: t.Text = "competitive",
+        page_size: int = 20,
+    ) -> t.Iterator[t.Mapping[str, t.Any]]:
+        """
+        Iterate over all of a player's competitive updates, newest first
+        Pages are requested page_size matches at a time; the next page is fetched in the background while the current one is consumed
+        """
+        self._check_queue_type(queue_id)
+        puuid = self._check_puuid(puuid)
+        return self._iter_pages(
+            lambda start: self.fetch_competitive_updates(
+                puuid, start_index=start, end_index=start + page_size, queue_id=queue_id
+            ),
+            "Matches",
+            page_size,
+        )
+
     def fetch_leaderboard(
         self, season: t.Text, start_index: int = 0, size: int = 25, region: t.Text = "na"
     ) -> dict:
@@ -384,7 +879,7 @@ class Client:
         """
         Store_GetEntitlements
         List what the player owns (agents, skins, buddies, ect.)
-        Correlate with the UUIDs in client.fetch_content() to know what items are owned
+        Correlate with the UUIDs in client.fetch_content() to know what items are owned (client.fetch_content_catalog().resolve(uuid))
 
         NOTE: uuid to item type
         "e7c63390-eda7-46e0-bb7a-a6abdacd2433": "skin_level",
@@ -411,6 +906,7 @@ class Client:
         data = self.fetch(
             endpoint=f"/parties/v1/players/{self.puuid}", endpoint_type="glz"
         )
+        self.session_state["party_id"] = data["CurrentPartyID"]
         return data
 
     def party_remove_player(self, puuid: t.Text) -> t.NoReturn:
@@ -418,10 +914,13 @@ class Client:
         Party_RemovePlayer
         Removes a player from the current party
         """
-        puuid = self.__check_puuid(puuid)
+        puuid = self._check_puuid(puuid)
         data = self.delete(endpoint=f"/parties/v1/players/{puuid}", endpoint_type="glz")
+        if puuid == self.puuid:
+            self.session_state.pop("party_id", None)
         return data
 
+    @retries_stale_id("party_id")
     def fetch_party(self) -> t.Mapping[str, t.Any]:
         """
         Party_FetchParty
@@ -433,6 +932,7 @@ class Client:
         )
         return data
 
+    @retries_stale_id("party_id")
     def party_set_member_ready(self, ready: bool) -> t.Mapping[str, t.Any]:
         """
         Party_SetMemberReady
@@ -446,6 +946,7 @@ class Client:
         )
         return data
 
+    @retries_stale_id("party_id")
     def party_refresh_competitive_tier(self) -> t.Mapping[str, t.Any]:
         """
         Party_RefreshCompetitiveTier
@@ -458,6 +959,7 @@ class Client:
         )
         return data
 
+    @retries_stale_id("party_id")
     def party_refresh_player_identity(self) -> t.Mapping[str, t.Any]:
         """
         Party_RefreshPlayerIdentity
@@ -470,6 +972,7 @@ class Client:
         )
         return data
 
+    @retries_stale_id("party_id")
     def party_refresh_pings(self) -> t.Mapping[str, t.Any]:
         """
         Party_RefreshPings
@@ -482,12 +985,13 @@ class Client:
         )
         return data
 
+    @retries_stale_id("party_id")
     def party_change_queue(self, queue_id: t.Text) -> t.Mapping[str, t.Any]:
         """
         Party_ChangeQueue
         Sets the matchmaking queue for the party
         """
-        self.__check_queue_type(queue_id)
+        self._check_queue_type(queue_id)
         party_id = self.__get_current_party_id()
         data = self.post(
             endpoint=f"/parties/v1/parties/{party_id}/queue",
@@ -496,6 +1000,7 @@ class Client:
         )
         return data
 
+    @retries_stale_id("party_id")
     def party_start_custom_game(self) -> t.Mapping[str, t.Any]:
         """
         Party_StartCustomGame
@@ -508,6 +1013,7 @@ class Client:
         )
         return data
 
+    @retries_stale_id("party_id")
     def party_enter_matchmaking_queue(self) -> t.Mapping[str, t.Any]:
         """
         Party_EnterMatchmakingQueue
@@ -520,6 +1026,7 @@ class Client:
         )
         return data
 
+    @retries_stale_id("party_id")
     def party_leave_matchmaking_queue(self) -> t.Mapping[str, t.Any]:
         """
         Party_LeaveMatchmakingQueue
@@ -532,6 +1039,7 @@ class Client:
         )
         return data
 
+    @retries_stale_id("party_id")
     def set_party_accessibility(self, open: bool) -> t.Mapping[str, t.Any]:
         """
         Party_SetAccessibility
@@ -546,6 +1054,7 @@ class Client:
         )
         return data
 
+    @retries_stale_id("party_id")
     def party_set_custom_game_settings(self, settings: t.Mapping) -> t.Mapping[str, t.Any]:
         """
         Party_SetCustomGameSettings
@@ -568,6 +1077,7 @@ class Client:
         )
         return data
 
+    @retries_stale_id("party_id")
     def party_invite_by_display_name(self, name: t.Text, tag: t.Text) -> t.Mapping[str, t.Any]:
         """
         Party_InviteToPartyByDisplayName
@@ -594,6 +1104,7 @@ class Client:
         )
         return data
 
+    @retries_stale_id("party_id")
     def party_decline_request(self, request_id: t.Text) -> t.Mapping[str, t.Any]:
         """
         Party_DeclineRequest
@@ -617,6 +1128,7 @@ class Client:
             endpoint=f"/parties/v1/players/{self.puuid}/joinparty/{party_id}",
             endpoint_type="glz",
         )
+        self.session_state.pop("party_id", None)
         return data
 
     def party_leave(self, party_id: t.Text) -> t.Mapping[str, t.Any]:
@@ -628,6 +1140,7 @@ class Client:
             endpoint=f"/parties/v1/players/{self.puuid}/leaveparty/{party_id}",
             endpoint_type="glz",
         )
+        self.session_state.pop("party_id", None)
         return data
 
     def party_fetch_custom_game_configs(self) -> t.Mapping[str, t.Any]:
@@ -640,6 +1153,7 @@ class Client:
         )
         return data
 
+    @retries_stale_id("party_id")
     def party_fetch_muc_token(self) -> t.Mapping[str, t.Any]:
         """
         Party_FetchMUCToken
@@ -651,6 +1165,7 @@ class Client:
         )
         return data
 
+    @retries_stale_id("party_id")
     def party_fetch_voice_token(self) -> t.Mapping[str, t.Any]:
         """
         Party_FetchVoiceToken
@@ -673,8 +1188,10 @@ class Client:
             endpoint_type="glz",
             exceptions={404: [PhaseError, "You are not in a core-game"]},
         )
+        self._remember_match_id("coregame", data["MatchID"])
         return data
 
+    @retries_stale_id("coregame_match_id")
     def coregame_fetch_match(self, match_id: str = None) -> t.Mapping[str, t.Any]:
         """
         CoreGame_FetchMatch
@@ -686,8 +1203,12 @@ class Client:
             endpoint_type="glz",
             exceptions={404: [PhaseError, "You are not in a core-game"]},
         )
+        if data.get("State", "IN_PROGRESS") != "IN_PROGRESS":
+            # the match is over, so the next call has to look up the new one
+            self._forget_match_id("coregame", match_id)
         return data
 
+    @retries_stale_id("coregame_match_id")
     def coregame_fetch_match_loadouts(self, match_id: t.Optional[t.Text] = None) -> t.Mapping[str, t.Any]:
         """
         CoreGame_FetchMatchLoadouts
@@ -701,6 +1222,7 @@ class Client:
         )
         return data
 
+    @retries_stale_id("coregame_match_id")
     def coregame_fetch_team_chat_muc_token(self, match_id: t.Optional[t.Text] = None) -> t.Mapping[str, t.Any]:
         """
         CoreGame_FetchTeamChatMUCToken
@@ -714,6 +1236,7 @@ class Client:
         )
         return data
 
+    @retries_stale_id("coregame_match_id")
     def coregame_fetch_allchat_muc_token(self, match_id: t.Optional[t.Text] = None) -> t.Mapping[str, t.Any]:
         """
         CoreGame_FetchAllChatMUCToken
@@ -727,6 +1250,7 @@ class Client:
         )
         return data
 
+    @retries_stale_id("coregame_match_id")
     def coregame_disassociate_player(self, match_id: t.Optional[t.Text] = None) -> t.Mapping[str, t.Any]:
         """
         CoreGame_DisassociatePlayer
@@ -738,6 +1262,7 @@ class Client:
             endpoint_type="glz",
             exceptions={404: [PhaseError, "You are not in a core-game"]},
         )
+        self._forget_match_id("coregame", match_id)
         return data
 
     # pregame endpoints
@@ -751,8 +1276,10 @@ class Client:
             endpoint_type="glz",
             exceptions={404: [PhaseError, "You are not in a pre-game"]},
         )
+        self._remember_match_id("pregame", data["MatchID"])
         return data
 
+    @retries_stale_id("pregame_match_id")
     def pregame_fetch_match(self, match_id: t.Optional[t.Text] = None) -> t.Mapping[str, t.Any]:
         """
         Pregame_GetMatch
@@ -766,6 +1293,7 @@ class Client:
         )
         return data
 
+    @retries_stale_id("pregame_match_id")
     def pregame_fetch_match_loadouts(self, match_id: t.Optional[t.Text] = None) -> t.Mapping[str, t.Any]:
         """
         Pregame_GetMatchLoadouts
@@ -779,6 +1307,7 @@ class Client:
         )
         return data
 
+    @retries_stale_id("pregame_match_id")
     def pregame_fetch_chat_token(self, match_id: t.Optional[t.Text] = None) -> t.Mapping[str, t.Any]:
         """
         Pregame_FetchChatToken
@@ -792,6 +1321,7 @@ class Client:
         )
         return data
 
+    @retries_stale_id("pregame_match_id")
     def pregame_fetch_voice_token(self, match_id: t.Optional[t.Text] = None) -> t.Mapping[str, t.Any]:
         """
         Pregame_FetchVoiceToken
@@ -805,6 +1335,7 @@ class Client:
         )
         return data
 
+    @retries_stale_id("pregame_match_id")
     def pregame_select_character(self, agent_id: t.Text, match_id: t.Optional[t.Text] = None) -> t.Mapping[str, t.Any]:
         """
         Pregame_SelectCharacter
@@ -820,6 +1351,7 @@ class Client:
         )
         return data
 
+    @retries_stale_id("pregame_match_id")
     def pregame_lock_character(self, agent_id: t.Text, match_id: t.Optional[t.Text] = None) -> t.Mapping[str, t.Any]:
         """
         Pregame_LockCharacter
@@ -835,6 +1367,7 @@ class Client:
         )
         return data
 
+    @retries_stale_id("pregame_match_id")
     def pregame_quit_match(self, match_id: t.Optional[t.Text] = None) -> t.Mapping[str, t.Any]:
         """
         Pregame_QuitMatch
@@ -846,6 +1379,7 @@ class Client:
             endpoint_type="glz",
             exceptions={404: [PhaseError, "You are not in a pre-game"]},
         )
+        self._forget_match_id("pregame", match_id)
         return data
 
     # contracts endpoints
@@ -939,14 +1473,25 @@ class Client:
         PRESENCE_RNet_GET
         NOTE: Only works on self or active user's friends
         """
-        puuid = self.__check_puuid(puuid)
+        puuid = self._check_puuid(puuid)
+        return self.fetch_presence_snapshot().private(puuid)
+
+    def fetch_presences(self, puuids: t.Iterable[t.Text]) -> t.Mapping[str, t.Any]:
+        """
+        PRESENCE_RNet_GET for many players with a single download
+        Returns {puuid: decoded private presence or None}
+        NOTE: Only works on self or active user's friends
+        """
+        snapshot = self.fetch_presence_snapshot()
+        return {puuid: snapshot.private(puuid) for puuid in puuids}
+
+    def fetch_presence_snapshot(self) -> PresenceSnapshot:
+        """
+        PRESENCE_RNet_GET_ALL
+        Get every presence indexed by puuid; private blobs are only decoded when they're read
+        """
         data = self.fetch(endpoint="/chat/v4/presences", endpoint_type="local")
-        try:
-            for presence in data["presences"]:
-                if presence["puuid"] == puuid:
-                    return json.loads(base64.b64decode(presence["private"]))
-        except:
-            return None
+        return PresenceSnapshot(data)
 
     def fetch_all_friend_presences(self) -> t.Mapping[str, t.Any]:
         """
@@ -957,6 +1502,14 @@ class Client:
         data = self.fetch(endpoint="/chat/v4/presences", endpoint_type="local")
         return data
 
+    def local_events(self, url: t.Optional[t.Text] = None) -> LocalEventStream:
+        """
+        Subscribe to presence, party, and game phase events pushed by the local Riot client
+        Use this instead of polling fetch_all_friend_presences/pregame_fetch_player/coregame_fetch_player
+        url: override the websocket url (e.g. to point at a stand-in server)
+        """
+        return LocalEventStream(self, url=url)
+
     def riotclient_session_fetch_sessions(self) -> t.Mapping[str, t.Any]:
         """
         RiotClientSession_FetchSessions
@@ -1025,11 +1578,36 @@ class Client:
         return data
 
     # local utility functions
+    def _iter_pages(self, fetch_page, key, page_size) -> t.Iterator[t.Mapping[str, t.Any]]:
+        """Yield the items under key from consecutive pages, prefetching the next page while the current one is consumed"""
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            start = 0
+            # pages are fetched in the consumer's context, so a background() crawl stays background priority
+            future = executor.submit(contextvars.copy_context().run, fetch_page, start)
+            while future is not None:
+                page = future.result()
+                items = page.get(key) or []
+                total = page.get("Total")  # competitive updates don't report a total
+                start += page_size
+                if len(items) >= page_size and (total is None or start < total):
+                    future = executor.submit(contextvars.copy_context().run, fetch_page, start)
+                else:
+                    future = None
+                yield from items
+
+    @staticmethod
+    def _reached_watermark(match, watermark) -> bool:
+        """Check if a match history entry is at or older than a sync watermark"""
+        return (
+            match["MatchID"] == watermark["MatchID"]
+            or match["GameStartTime"] <= watermark["GameStartTime"]
+        )
+
     def __get_live_season(self) -> str:
         """Get the UUID of the live competitive season"""
         return self.fetch_mmr()["LatestCompetitiveUpdate"]["SeasonID"]
 
-    def __check_puuid(self, puuid) -> str:
+    def _check_puuid(self, puuid) -> str:
         """If puuid passed into method is None make it current user's puuid"""
         return self.puuid if puuid is None else puuid
 
@@ -1039,17 +1617,57 @@ class Client:
 
     def __get_current_party_id(self) -> str:
         """Get the user's current party ID"""
+        if "party_id" in self.session_state:
+            return self.session_state["party_id"]
         party = self.party_fetch_player()
         return party["CurrentPartyID"]
 
     def __coregame_check_match_id(self, match_id) -> str:
         """Check if a match id was passed into the method"""
-        return self.coregame_fetch_player()["MatchID"] if match_id is None else match_id
+        if match_id is not None:
+            return match_id
+        if "coregame_match_id" in self.session_state:
+            return self.session_state["coregame_match_id"]
+        return self.coregame_fetch_player()["MatchID"]
 
     def __pregame_check_match_id(self, match_id) -> str:
-        return self.pregame_fetch_player()["MatchID"] if match_id is None else match_id
+        if match_id is not None:
+            return match_id
+        if "pregame_match_id" in self.session_state:
+            return self.session_state["pregame_match_id"]
+        return self.pregame_fetch_player()["MatchID"]
+
+    def _remember_match_id(self, phase, match_id) -> None:
+        """Cache the match ID for a phase; being in one phase means the other one is over"""
+        self.session_state[f"{phase}_match_id"] = match_id
+        self.session_state.pop(
+            "pregame_match_id" if phase == "coregame" else "coregame_match_id", None
+        )
 
-    def __check_queue_type(self, queue_id) -> t.NoReturn:
+    def _forget_match_id(self, phase, match_id) -> None:
+        """Drop the cached match ID for a phase if it's still match_id"""
+        if self.session_state.get(f"{phase}_match_id") == match_id:
+            self.session_state.pop(f"{phase}_match_id", None)
+
+    def _expire_session_state(self, endpoint, status_code) -> None:
+        """Drop cached IDs that a 404 from a party/pregame/coregame endpoint shows are stale"""
+        if status_code != 404:
+            return
+        key = None
+        if endpoint.startswith("/core-game/"):
+            key = "coregame_match_id"
+        elif endpoint.startswith("/pregame/"):
+            key = "pregame_match_id"
+        elif endpoint.startswith("/parties/"):
+            key = "party_id"
+        if key is None:
+            return
+        stale_id = self.session_state.pop(key, None)
+        expired = expired_ids.get()
+        if stale_id is not None and expired is not None:
+            expired.append((key, stale_id))
+
+    def _check_queue_type(self, queue_id) -> t.NoReturn:
         """Check if queue id is valid"""
         if queue_id not in queues:
             raise ValueError("Invalid queue type")
@@ -1061,6 +1679,18 @@ class Client:
         base_url_shared = base_endpoint_shared.format(shard=self.shard)
         return base_url, base_url_glz, base_url_shared
 
+    def _get_base_url(self, endpoint_type) -> str:
+        """Get the base URL for an endpoint family"""
+        if endpoint_type == "glz":
+            return self.base_url_glz
+        if endpoint_type == "shared":
+            return self.base_url_shared
+        if endpoint_type == "local":
+            if self.base_url_local is not None:
+                return self.base_url_local
+            return "https://127.0.0.1:{port}".format(port=self.lockfile["port"])
+        return self.base_url
+
     def __get_headers(self) -> t.Tuple[t.Text, t.Mapping[t.Text, t.Any]]:
         """Get authorization headers to make requests"""
         try:
@@ -1077,7 +1707,34 @@ class Client:
 
     def __get_auth_headers(self) -> t.Tuple[t.Text, t.Mapping[t.Text, t.Any]]: 
         # headers for pd/glz endpoints
-        local_headers = {
+        local_headers = self._build_local_headers()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # the client version doesn't depend on the entitlements token; look it up alongside it if it isn't cached
+            version = None
+            if self.version_cache.current() is None:
+                version = executor.submit(self.__get_current_version)
+            response = self.session_pool.get("local").get(
+                f"{self._get_base_url('local')}/entitlements/v1/token",
+                headers=local_headers,
+                verify=False,
+            )
+            entitlements = response.json()
+            puuid = entitlements["subject"]
+            version = version.result() if version is not None else self.__get_current_version()
+        headers = self._build_headers(entitlements, version)
+        return puuid, headers, local_headers
+
+    def __refresh_tokens(self) -> t.Optional[float]:
+        """Get new tokens and return when they expire; called by the token manager"""
+        if self.auth is None:
+            self.puuid, self.headers, self.local_headers = self.__get_headers()
+            return token_expiry(self.headers)
+        self.puuid, self.headers, self.local_headers = self.auth.authenticate()
+        return self.auth.expires_at
+
+    def _build_local_headers(self) -> t.Mapping[t.Text, t.Any]:
+        """Build the basic auth headers for the local riotclient server from the lockfile"""
+        return {
             "Authorization": (
                 "Basic "
                 + base64.b64encode(
@@ -1085,29 +1742,29 @@ class Client:
                 ).decode()
             )
         }
-        response = requests.get(
-            "https://127.0.0.1:{port}/entitlements/v1/token".format(
-                port=self.lockfile["port"]
-            ),
-            headers=local_headers,
-            verify=False,
-        )
-        entitlements = response.json()
-        puuid = entitlements["subject"]
-        headers = {
+
+    def _build_headers(self, entitlements, version) -> t.Mapping[t.Text, t.Any]:
+        """Build pd/glz headers from a local entitlements token response"""
+        return {
             "Authorization": f"Bearer {entitlements['accessToken']}",
             "X-Riot-Entitlements-JWT": entitlements["token"],
             "X-Riot-ClientPlatform": self.client_platform,
-            "X-Riot-ClientVersion": self.__get_current_version(),
+            "X-Riot-ClientVersion": version,
         }
-        return puuid, headers, local_headers
 
     def __get_current_version(self) -> str:
+        return self.version_cache.get(self.__fetch_current_version)
+
+    def __fetch_current_version(self) -> str:
         data = requests.get("https://valorant-api.com/v1/version")
-        data = data.json()["data"]
-        return f"{data['branch']}-shipping-{data['buildVersion']}-{data['version'].split('.')[3]}"  # return formatted version string
+        return self._format_version(data.json()["data"])
+
+    @staticmethod
+    def _format_version(data) -> str:
+        """Format the client version string from a valorant-api.com version response"""
+        return f"{data['branch']}-shipping-{data['buildVersion']}-{data['version'].split('.')[3]}"
 
-    def __get_lockfile(self) -> t.Optional[t.Mapping[str, t.Any]]:
+    def _get_lockfile(self) -> t.Optional[t.Mapping[str, t.Any]]:
         try:
             with open(self.lockfile_path) as lockfile:
                 data = lockfile.read().split(":")
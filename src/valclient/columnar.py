@@ -0,0 +1,232 @@
+import typing as t
+
+try:
+    import numpy
+except ImportError:  # numpy is only needed for MatchColumns.arrays/records
+    numpy = None
+
+# table: [(column, numpy dtype, category or None)]
+# columns with a category hold integer codes (-1 for missing) that index into MatchColumns.categories[category]
+schema = {
+    "players": [
+        ("match", "int32", "match"),
+        ("player", "int32", "player"),
+        ("team", "int8", "team"),
+        ("character", "int32", "item"),
+        ("competitive_tier", "int16", None),
+        ("rounds_played", "int16", None),
+        ("score", "int32", None),
+        ("kills", "int16", None),
+        ("deaths", "int16", None),
+        ("assists", "int16", None),
+    ],
+    "rounds": [
+        ("match", "int32", "match"),
+        ("round", "int16", None),
+        ("winning_team", "int8", "team"),
+        ("result_code", "int16", "label"),
+        ("plant_site", "int16", "label"),
+        ("planter", "int32", "player"),
+        ("defuser", "int32", "player"),
+        ("plant_round_time", "int32", None),
+        ("defuse_round_time", "int32", None),
+    ],
+    "kills": [
+        ("match", "int32", "match"),
+        ("round", "int16", None),
+        ("game_time", "int32", None),
+        ("round_time", "int32", None),
+        ("killer", "int32", "player"),
+        ("victim", "int32", "player"),
+        ("assists", "int8", None),
+        ("damage_type", "int16", "label"),
+        ("damage_item", "int32", "item"),
+        ("secondary_fire", "bool", None),
+        ("victim_x", "float32", None),
+        ("victim_y", "float32", None),
+    ],
+    "damage": [
+        ("match", "int32", "match"),
+        ("round", "int16", None),
+        ("attacker", "int32", "player"),
+        ("receiver", "int32", "player"),
+        ("damage", "int32", None),
+        ("legshots", "int16", None),
+        ("bodyshots", "int16", None),
+        ("headshots", "int16", None),
+    ],
+    "economy": [
+        ("match", "int32", "match"),
+        ("round", "int16", None),
+        ("player", "int32", "player"),
+        ("loadout_value", "int32", None),
+        ("weapon", "int32", "item"),
+        ("armor", "int32", "item"),
+        ("remaining", "int32", None),
+        ("spent", "int32", None),
+    ],
+}
+
+
+class Categories:
+    def __init__(self):
+        """Assigns a stable integer code to every distinct string it sees"""
+        self.codes = {}
+        self.values = []
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def code(self, value: t.Optional[t.Text]) -> int:
+        if value is None:
+            return -1
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def decode(self, code: int) -> t.Optional[t.Text]:
+        return self.values[code] if code >= 0 else None
+
+
+class MatchColumns:
+    def __init__(self, matches: t.Iterable[t.Mapping[str, t.Any]] = ()):
+        """
+        Flattens match details payloads into column-oriented tables for vectorized analysis
+        tables: players, rounds, kills, damage, economy (see schema for their columns)
+        string IDs (puuids, teams, weapon/agent UUIDs, ...) are stored as integer codes; look them up with
+        categories[name].decode(code) or categories[name].code(value)
+
+        e.g. headshot % per player:
+            damage = columns.arrays("damage")
+            shots = numpy.bincount(damage["attacker"], damage["headshots"] + damage["bodyshots"] + damage["legshots"])
+            headshots = numpy.bincount(damage["attacker"], damage["headshots"]) / shots
+        """
+        self.categories = {name: Categories() for name in ["match", "player", "team", "item", "label"]}
+        self.tables = {table: {column: [] for column, _, _ in columns} for table, columns in schema.items()}
+        for match in matches:
+            self.add(match)
+
+    def __len__(self) -> int:
+        """Number of matches added"""
+        return len(self.categories["match"])
+
+    def add(self, match: t.Mapping[str, t.Any]) -> None:
+        """Append one fetch_match_details payload"""
+        match_code = self.categories["match"].code((match.get("matchInfo") or {}).get("matchId"))
+
+        for player in match.get("players") or []:
+            stats = player.get("stats") or {}
+            self.__append(
+                "players",
+                match=match_code,
+                player=player.get("subject"),
+                team=player.get("teamId"),
+                character=player.get("characterId"),
+                competitive_tier=player.get("competitiveTier"),
+                rounds_played=stats.get("roundsPlayed"),
+                score=stats.get("score"),
+                kills=stats.get("kills"),
+                deaths=stats.get("deaths"),
+                assists=stats.get("assists"),
+            )
+
+        per_round_kills = []
+        for round_ in match.get("roundResults") or []:
+            round_num = round_.get("roundNum")
+            self.__append(
+                "rounds",
+                match=match_code,
+                round=round_num,
+                winning_team=round_.get("winningTeam"),
+                result_code=round_.get("roundResultCode"),
+                plant_site=round_.get("plantSite") or None,
+                planter=round_.get("bombPlanter"),
+                defuser=round_.get("bombDefuser"),
+                plant_round_time=round_.get("plantRoundTime"),
+                defuse_round_time=round_.get("defuseRoundTime"),
+            )
+            for stats in round_.get("playerStats") or []:
+                subject = stats.get("subject")
+                per_round_kills.extend(stats.get("kills") or [])
+                for damage in stats.get("damage") or []:
+                    self.__append(
+                        "damage",
+                        match=match_code,
+                        round=round_num,
+                        attacker=subject,
+                        receiver=damage.get("receiver"),
+                        damage=damage.get("damage"),
+                        legshots=damage.get("legshots"),
+                        bodyshots=damage.get("bodyshots"),
+                        headshots=damage.get("headshots"),
+                    )
+                economy = stats.get("economy")
+                if economy:
+                    self.__append(
+                        "economy",
+                        match=match_code,
+                        round=round_num,
+                        player=subject,
+                        loadout_value=economy.get("loadoutValue"),
+                        weapon=economy.get("weapon") or None,
+                        armor=economy.get("armor") or None,
+                        remaining=economy.get("remaining"),
+                        spent=economy.get("spent"),
+                    )
+
+        # the top-level kills list has every kill; fall back to the per-round lists if it's missing
+        kills = match.get("kills")
+        for kill in kills if kills is not None else per_round_kills:
+            location = kill.get("victimLocation") or {}
+            finishing_damage = kill.get("finishingDamage") or {}
+            self.__append(
+                "kills",
+                match=match_code,
+                round=kill.get("round"),
+                game_time=kill.get("gameTime"),
+                round_time=kill.get("roundTime"),
+                killer=kill.get("killer"),
+                victim=kill.get("victim"),
+                assists=len(kill.get("assistants") or []),
+                damage_type=finishing_damage.get("damageType"),
+                damage_item=finishing_damage.get("damageItem") or None,
+                secondary_fire=finishing_damage.get("isSecondaryFireMode"),
+                victim_x=location.get("x"),
+                victim_y=location.get("y"),
+            )
+
+    def __append(self, table, match, **values) -> None:
+        columns = self.tables[table]
+        columns["match"].append(match)
+        for column, _, category in schema[table][1:]:
+            value = values.get(column)
+            if category is not None:
+                value = self.categories[category].code(value)
+            columns[column].append(value)
+
+    def rows(self, table: t.Text) -> int:
+        return len(self.tables[table]["match"])
+
+    def arrays(self, table: t.Text) -> t.Mapping[str, t.Any]:
+        """One table as {column: numpy array}; missing numbers are 0 (NaN for locations), missing codes are -1"""
+        if numpy is None:
+            raise ImportError("MatchColumns.arrays requires numpy; install it with pip install numpy")
+        arrays = {}
+        for column, dtype, _ in schema[table]:
+            values = self.tables[table][column]
+            if dtype.startswith("float"):
+                values = [numpy.nan if value is None else value for value in values]
+            elif None in values:
+                values = [0 if value is None else value for value in values]
+            arrays[column] = numpy.array(values, dtype=dtype)
+        return arrays
+
+    def records(self, table: t.Text) -> t.Any:
+        """One table as a numpy structured array (a record batch with one field per column)"""
+        arrays = self.arrays(table)
+        records = numpy.empty(self.rows(table), dtype=[(column, dtype) for column, dtype, _ in schema[table]])
+        for column, values in arrays.items():
+            records[column] = values
+        return records
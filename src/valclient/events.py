@@ -0,0 +1,200 @@
+import typing as t
+import asyncio
+import json
+import ssl
+import threading
+
+try:
+    import websockets
+except ImportError:  # websockets is only needed for LocalEventStream
+    websockets = None
+
+from .presence import Presence
+
+# websocket events the stream subscribes to
+presence_event = "OnJsonApiEvent_chat_v4_presences"
+message_event = "OnJsonApiEvent_riot-messaging-service_v1_message"
+
+# riot-messaging-service resource prefix: event kind
+message_kinds = {
+    "ares-parties": "party",
+    "ares-pregame": "pregame",
+    "ares-core-game": "coregame",
+}
+
+event_kinds = ["presence", "party", "pregame", "coregame", "phase"]
+
+
+class LocalEvent:
+    __slots__ = ("kind", "uri", "event_type", "data")
+
+    def __init__(self, kind: t.Text, uri: t.Text, event_type: t.Text, data: t.Any):
+        """
+        kind: presence, party, pregame, coregame, or phase
+        uri: resource the event is about
+        event_type: Create, Update, or Delete
+        data: a Presence for presence events, the new phase (MENUS, PREGAME, INGAME) for phase events,
+        the decoded message payload otherwise
+        """
+        self.kind = kind
+        self.uri = uri
+        self.event_type = event_type
+        self.data = data
+
+    def __repr__(self):
+        return f"LocalEvent(kind={self.kind!r}, uri={self.uri!r}, event_type={self.event_type!r})"
+
+
+class LocalEventStream:
+    def __init__(self, client, url: t.Optional[t.Text] = None, reconnect_delay: float = 1):
+        """
+        Push-based presence/party/game-phase events from the local Riot client websocket
+        requires websockets (pip install websockets) and an activated client using the lockfile
+
+        url: websocket url; defaults to the local Riot client (wss://127.0.0.1:{lockfile port})
+        reconnect_delay: seconds to wait before reconnecting when the connection drops
+
+        use `async for event in stream.events()`, or register callbacks with stream.on(kind, callback)
+        and run them with `await stream.run()` (or stream.start() to run them on a background thread)
+        """
+        if websockets is None:
+            raise ImportError("LocalEventStream requires websockets; install it with pip install websockets")
+
+        self.client = client
+        self.url = url if url is not None else f"wss://127.0.0.1:{client.lockfile['port']}"
+        self.reconnect_delay = reconnect_delay
+        self.callbacks = {kind: [] for kind in event_kinds}
+        self.phase = None
+        self.stopped = False
+        self.thread = None
+        self.loop = None
+        self.connection = None  # the open websocket, closed by stop()
+
+    def on(self, kind: t.Text, callback: t.Callable[[LocalEvent], t.Any]) -> None:
+        """Call callback with every event of a kind; callbacks may be plain functions or coroutine functions"""
+        if kind not in self.callbacks:
+            raise ValueError(f"Invalid event kind, valid kinds are: {event_kinds}")
+        self.callbacks[kind].append(callback)
+
+    async def events(self) -> t.AsyncIterator[LocalEvent]:
+        """Yield events as they arrive, reconnecting if the connection drops, until stop() is called"""
+        self.stopped = False
+        while not self.stopped:
+            try:
+                async with self.__connect() as connection:
+                    if self.stopped:
+                        return
+                    self.connection = connection
+                    for event_name in [presence_event, message_event]:
+                        await connection.send(json.dumps([5, event_name]))
+                    async for message in connection:
+                        for event in self.__parse(message):
+                            yield event
+                        if self.stopped:
+                            return
+            except (OSError, websockets.exceptions.ConnectionClosed):
+                if self.stopped:
+                    return
+                await asyncio.sleep(self.reconnect_delay)
+            finally:
+                self.connection = None
+
+    async def run(self) -> None:
+        """Dispatch events to the registered callbacks until stop() is called"""
+        async for event in self.events():
+            for callback in self.callbacks[event.kind]:
+                result = callback(event)
+                if asyncio.iscoroutine(result):
+                    await result
+
+    def start(self) -> None:
+        """Run the callbacks on a background thread with its own event loop"""
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.__run_loop, args=(self.loop,), daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        """Stop the stream, closing the connection so it doesn't wait for another event"""
+        self.stopped = True
+        if self.thread is not None and self.thread.is_alive():
+            try:
+                self.loop.call_soon_threadsafe(self.__close_connection)
+            except RuntimeError:  # the loop already finished
+                pass
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:  # not called from the loop running the stream
+            return
+        self.__close_connection()
+
+    def __run_loop(self, loop) -> None:
+        try:
+            loop.run_until_complete(self.run())
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            loop.close()
+
+    def __close_connection(self) -> None:
+        if self.connection is not None:
+            asyncio.ensure_future(self.connection.close())
+
+    def __connect(self):
+        ssl_context = None
+        if self.url.startswith("wss://"):
+            # the local riot client uses a self-signed certificate
+            ssl_context = ssl.create_default_context()
+            ssl_context.check_hostname = False
+            ssl_context.verify_mode = ssl.CERT_NONE
+        headers = self.client.local_headers or self.client._build_local_headers()
+        if int(websockets.__version__.split(".")[0]) >= 14:
+            return websockets.connect(self.url, ssl=ssl_context, additional_headers=headers)
+        return websockets.connect(self.url, ssl=ssl_context, extra_headers=headers)
+
+    def __parse(self, message) -> t.List[LocalEvent]:
+        try:
+            opcode, event_name, payload = json.loads(message)
+        except ValueError:  # subscription acks are empty messages
+            return []
+        if opcode != 8:
+            return []
+
+        uri = payload.get("uri", "")
+        event_type = payload.get("eventType", "")
+        data = payload.get("data")
+
+        if event_name == presence_event:
+            events = []
+            for raw in (data or {}).get("presences") or []:
+                presence = Presence(raw)
+                events.append(LocalEvent("presence", uri, event_type, presence))
+                if raw.get("puuid") == self.client.puuid:
+                    events.extend(self.__phase_change(uri, event_type, presence))
+            return events
+
+        resource = uri.split("/riot-messaging-service/v1/message/")[-1]
+        for prefix, kind in message_kinds.items():
+            if resource.startswith(prefix):
+                payload_data = data.get("payload") if isinstance(data, dict) else data
+                try:
+                    payload_data = json.loads(payload_data)
+                except (TypeError, ValueError):
+                    pass
+                return [LocalEvent(kind, uri, event_type, payload_data)]
+        return []
+
+    def __phase_change(self, uri, event_type, presence) -> t.List[LocalEvent]:
+        """Emit a phase event when the active player's sessionLoopState changes"""
+        private = presence.private
+        if not isinstance(private, dict):
+            return []
+        phase = private.get("sessionLoopState")
+        if phase is None:
+            phase = (private.get("matchPresenceData") or {}).get("sessionLoopState")
+        if phase is None or phase == self.phase:
+            return []
+        self.phase = phase
+        # cached match IDs belong to the previous phase
+        self.client.session_state.pop("pregame_match_id", None)
+        self.client.session_state.pop("coregame_match_id", None)
+        return [LocalEvent("phase", uri, event_type, phase)]
@@ -0,0 +1,191 @@
+import typing as t
+import csv
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .resources import regions as all_regions
+from .resources import region_shard_override, shard_region_override
+from .ratelimit import RequestScheduler
+from .exceptions import ResponseError
+
+leaderboard_fields = [
+    "region",
+    "leaderboardRank",
+    "puuid",
+    "gameName",
+    "tagLine",
+    "rankedRating",
+    "numberOfWins",
+    "competitiveTier",
+    "IsBanned",
+    "IsAnonymized",
+    "PlayerCardID",
+    "TitleID",
+]
+
+
+class NDJSONWriter:
+    def __init__(self, path: t.Text, append: bool = False):
+        """Writes one JSON object per line"""
+        self.file = open(path, "a" if append else "w")
+
+    def write(self, row: t.Mapping[str, t.Any]) -> None:
+        self.file.write(json.dumps(row) + "\n")
+
+    def flush(self) -> None:
+        self.file.flush()
+
+    def close(self) -> None:
+        self.file.close()
+
+
+class CSVWriter:
+    def __init__(self, path: t.Text, append: bool = False, fields: t.Sequence[t.Text] = leaderboard_fields):
+        """Writes rows as CSV, keeping only the given fields"""
+        write_header = not append or not os.path.exists(path) or os.path.getsize(path) == 0
+        self.file = open(path, "a" if append else "w", newline="")
+        self.writer = csv.DictWriter(self.file, fieldnames=list(fields), extrasaction="ignore")
+        if write_header:
+            self.writer.writeheader()
+
+    def write(self, row: t.Mapping[str, t.Any]) -> None:
+        self.writer.writerow(row)
+
+    def flush(self) -> None:
+        self.file.flush()
+
+    def close(self) -> None:
+        self.file.close()
+
+
+class LeaderboardCrawler:
+    def __init__(
+        self,
+        clients,
+        season: t.Text,
+        regions: t.Optional[t.Iterable[t.Text]] = None,
+        page_size: int = 200,
+        max_workers: int = 4,
+        requests_per_second: t.Optional[float] = None,
+        checkpoint_path: t.Optional[t.Text] = None,
+    ):
+        """
+        Downloads whole competitive leaderboards, fetching pages concurrently and streaming rows to a writer
+
+        clients: an activated Client, or {shard: Client} to crawl regions on more than one shard
+        season: season UUID
+        regions: leaderboard regions to crawl; defaults to every region the given clients' shards serve
+        page_size: players per request
+        max_workers: pages fetched at once per region
+        requests_per_second: optional cap on page requests, on top of the clients' own schedulers
+        checkpoint_path: JSON file recording the last completed offset per region; an interrupted crawl
+        with the same checkpoint resumes where it stopped (open the writer with append=True)
+        """
+        if not isinstance(clients, dict):
+            clients = {clients.shard: clients}
+        self.clients = clients
+        self.season = season
+        if regions is None:
+            regions = [
+                region
+                for region in all_regions
+                if region not in shard_region_override and self.__shard(region) in clients
+            ]
+        self.regions = list(regions)
+        self.page_size = page_size
+        self.max_workers = max_workers
+        self.scheduler = None
+        if requests_per_second is not None:
+            self.scheduler = RequestScheduler({"leaderboard": (requests_per_second, max_workers)})
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint = self.__load_checkpoint()
+        self.lock = threading.Lock()
+
+    def crawl(self, writer) -> int:
+        """Crawl every region into writer (anything with a write(row) method); returns the number of rows written"""
+        written = 0
+        for region in self.regions:
+            written += self.crawl_region(region, writer)
+        return written
+
+    def crawl_region(self, region: t.Text, writer) -> int:
+        """Crawl one region into writer; returns the number of rows written"""
+        state = self.checkpoint["regions"].get(region, {"offset": 0, "done": False})
+        if state["done"]:
+            return 0
+        client = self.clients[self.__shard(region)]
+
+        first = self.__fetch_page(client, region, state["offset"])
+        total = first.get("totalPlayers", 0)
+        written = self.__write_page(region, first, state["offset"], total, writer)
+        offsets = range(state["offset"] + self.page_size, total, self.page_size)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # pages finish in any order, but only a window of max_workers is in flight and they're
+            # written in order so the checkpoint always points at a contiguous prefix
+            pending = {}
+            offsets = iter(offsets)
+            for offset in offsets:
+                pending[offset] = executor.submit(self.__fetch_page, client, region, offset)
+                if len(pending) >= self.max_workers:
+                    break
+            while len(pending) > 0:
+                offset = min(pending)
+                page = pending.pop(offset).result()
+                written += self.__write_page(region, page, offset, total, writer)
+                next_offset = next(offsets, None)
+                if next_offset is not None:
+                    pending[next_offset] = executor.submit(self.__fetch_page, client, region, next_offset)
+
+        if total == 0:
+            self.__save_checkpoint(region, 0, True)
+        return written
+
+    def __fetch_page(self, client, region, offset) -> t.Mapping[str, t.Any]:
+        if self.scheduler is not None:
+            self.scheduler.acquire("leaderboard", region)
+        # crawling shouldn't hold up interactive calls made with the same client
+        with RequestScheduler.background():
+            page = client.fetch_leaderboard(
+                self.season, start_index=offset, size=self.page_size, region=region
+            )
+        # fetch_leaderboard returns None for an error body (e.g. a 5xx once retries run out)
+        if not isinstance(page, dict) or "httpStatus" in page:
+            raise ResponseError(f"Unable to fetch the {region} leaderboard page at offset {offset}")
+        return page
+
+    def __write_page(self, region, page, offset, total, writer) -> int:
+        players = page.get("Players") or []
+        for player in players:
+            row = {"region": region}
+            row.update(player)
+            writer.write(row)
+        if hasattr(writer, "flush"):
+            writer.flush()
+        next_offset = offset + self.page_size
+        self.__save_checkpoint(region, next_offset, next_offset >= total or len(players) == 0)
+        return len(players)
+
+    @staticmethod
+    def __shard(region) -> t.Text:
+        return region_shard_override.get(region, region)
+
+    def __load_checkpoint(self) -> t.Mapping[str, t.Any]:
+        if self.checkpoint_path is not None and os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path) as f:
+                checkpoint = json.load(f)
+            if checkpoint.get("season") == self.season:
+                return checkpoint
+        return {"season": self.season, "regions": {}}
+
+    def __save_checkpoint(self, region, offset, done) -> None:
+        with self.lock:
+            self.checkpoint["regions"][region] = {"offset": offset, "done": done}
+            if self.checkpoint_path is None:
+                return
+            temp_path = f"{self.checkpoint_path}.tmp"
+            with open(temp_path, "w") as f:
+                json.dump(self.checkpoint, f)
+            os.replace(temp_path, self.checkpoint_path)
@@ -0,0 +1,108 @@
+import typing as t
+import json
+import sqlite3
+import threading
+import zlib
+
+
+class MatchStore:
+    def __init__(self, path: t.Text = "matches.db"):
+        """
+        Persistent store for finished match details, keyed by match ID
+        payloads are saved as zlib-compressed JSON in a SQLite database
+        use ":memory:" as the path for a store that only lives as long as the process
+        """
+        self.path = path
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        with self.lock, self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS matches (match_id TEXT PRIMARY KEY, data BLOB NOT NULL)"
+            )
+
+    def __contains__(self, match_id: t.Text) -> bool:
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT 1 FROM matches WHERE match_id = ?", (match_id,)
+            ).fetchone()
+        return row is not None
+
+    def __len__(self) -> int:
+        with self.lock:
+            return self.connection.execute("SELECT COUNT(*) FROM matches").fetchone()[0]
+
+    def get(self, match_id: t.Text) -> t.Optional[t.Mapping[str, t.Any]]:
+        """Get the stored details for a match, or None if it isn't stored"""
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT data FROM matches WHERE match_id = ?", (match_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return self.__decode(row[0])
+
+    def get_many(self, match_ids: t.Iterable[t.Text]) -> t.Mapping[str, t.Mapping[str, t.Any]]:
+        """Get every stored match out of match_ids as {match_id: details}"""
+        match_ids = list(match_ids)
+        found = {}
+        # stay under sqlite's bound parameter limit
+        for i in range(0, len(match_ids), 500):
+            chunk = match_ids[i : i + 500]
+            with self.lock:
+                rows = self.connection.execute(
+                    f"SELECT match_id, data FROM matches WHERE match_id IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+            for match_id, data in rows:
+                found[match_id] = self.__decode(data)
+        return found
+
+    def missing(self, match_ids: t.Iterable[t.Text]) -> t.List[t.Text]:
+        """Get the match IDs out of match_ids that aren't stored yet"""
+        match_ids = list(dict.fromkeys(match_ids))
+        stored = set()
+        for i in range(0, len(match_ids), 500):
+            chunk = match_ids[i : i + 500]
+            with self.lock:
+                rows = self.connection.execute(
+                    f"SELECT match_id FROM matches WHERE match_id IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+            stored.update(row[0] for row in rows)
+        return [match_id for match_id in match_ids if match_id not in stored]
+
+    def put(self, match_id: t.Text, data: t.Mapping[str, t.Any]) -> None:
+        """Store the details for a match"""
+        self.put_many({match_id: data})
+
+    def put_many(self, matches: t.Mapping[t.Text, t.Mapping[str, t.Any]]) -> None:
+        """Store the details for many matches in one transaction"""
+        rows = [(match_id, self.__encode(data)) for match_id, data in matches.items()]
+        with self.lock, self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO matches (match_id, data) VALUES (?, ?)", rows
+            )
+
+    def delete(self, match_id: t.Text) -> None:
+        """Remove a match from the store"""
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM matches WHERE match_id = ?", (match_id,))
+
+    def close(self) -> None:
+        with self.lock:
+            self.connection.close()
+
+    @staticmethod
+    def is_complete(data: t.Mapping[str, t.Any]) -> bool:
+        """Check if a match details payload is final and safe to store"""
+        if not isinstance(data, dict) or "matchInfo" not in data:
+            return False
+        return data["matchInfo"].get("isCompleted", True)
+
+    @staticmethod
+    def __encode(data) -> bytes:
+        return zlib.compress(json.dumps(data, separators=(",", ":")).encode())
+
+    @staticmethod
+    def __decode(blob) -> t.Mapping[str, t.Any]:
+        return json.loads(zlib.decompress(blob))
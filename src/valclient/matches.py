@@ -0,0 +1,299 @@
+import typing as t
+import json
+import sys
+
+_missing = object()
+
+
+def _intern(value):
+    """puuids, team names and content UUIDs repeat thousands of times across matches, so share one copy of each"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Player:
+    __slots__ = (
+        "subject",
+        "game_name",
+        "tag_line",
+        "team_id",
+        "character_id",
+        "competitive_tier",
+        "score",
+        "rounds_played",
+        "kills",
+        "deaths",
+        "assists",
+    )
+
+    def __init__(self, raw: t.Mapping[str, t.Any]):
+        """One entry from a match's players list"""
+        stats = raw.get("stats") or {}
+        self.subject = _intern(raw.get("subject"))
+        self.game_name = raw.get("gameName")
+        self.tag_line = raw.get("tagLine")
+        self.team_id = _intern(raw.get("teamId"))
+        self.character_id = _intern(raw.get("characterId"))
+        self.competitive_tier = raw.get("competitiveTier")
+        self.score = stats.get("score")
+        self.rounds_played = stats.get("roundsPlayed")
+        self.kills = stats.get("kills")
+        self.deaths = stats.get("deaths")
+        self.assists = stats.get("assists")
+
+    def __repr__(self):
+        return f"Player(subject={self.subject!r}, character_id={self.character_id!r})"
+
+
+class Kill:
+    __slots__ = (
+        "round",
+        "game_time",
+        "round_time",
+        "killer",
+        "victim",
+        "assistants",
+        "victim_x",
+        "victim_y",
+        "damage_type",
+        "damage_item",
+        "secondary_fire",
+        "player_locations",
+    )
+
+    def __init__(self, raw: t.Mapping[str, t.Any]):
+        """
+        One kill; player_locations is a tuple of (subject, x, y, view radians) for everyone alive at the time
+        """
+        victim_location = raw.get("victimLocation") or {}
+        finishing_damage = raw.get("finishingDamage") or {}
+        self.round = raw.get("round")
+        self.game_time = raw.get("gameTime")
+        self.round_time = raw.get("roundTime")
+        self.killer = _intern(raw.get("killer"))
+        self.victim = _intern(raw.get("victim"))
+        self.assistants = tuple(_intern(puuid) for puuid in raw.get("assistants") or ())
+        self.victim_x = victim_location.get("x")
+        self.victim_y = victim_location.get("y")
+        self.damage_type = _intern(finishing_damage.get("damageType"))
+        self.damage_item = _intern(finishing_damage.get("damageItem"))
+        self.secondary_fire = finishing_damage.get("isSecondaryFireMode")
+        self.player_locations = tuple(
+            (
+                _intern(entry.get("subject")),
+                (entry.get("location") or {}).get("x"),
+                (entry.get("location") or {}).get("y"),
+                entry.get("viewRadians"),
+            )
+            for entry in raw.get("playerLocations") or ()
+        )
+
+    def __repr__(self):
+        return f"Kill(round={self.round!r}, killer={self.killer!r}, victim={self.victim!r})"
+
+
+class DamageEvent:
+    __slots__ = ("round", "attacker", "receiver", "damage", "legshots", "bodyshots", "headshots")
+
+    def __init__(self, round_num: int, attacker: t.Text, raw: t.Mapping[str, t.Any]):
+        """Damage one player dealt to another over a round"""
+        self.round = round_num
+        self.attacker = _intern(attacker)
+        self.receiver = _intern(raw.get("receiver"))
+        self.damage = raw.get("damage", 0)
+        self.legshots = raw.get("legshots", 0)
+        self.bodyshots = raw.get("bodyshots", 0)
+        self.headshots = raw.get("headshots", 0)
+
+    def __repr__(self):
+        return f"DamageEvent(round={self.round!r}, attacker={self.attacker!r}, receiver={self.receiver!r}, damage={self.damage!r})"
+
+
+class Round:
+    __slots__ = (
+        "number",
+        "result",
+        "result_code",
+        "winning_team",
+        "bomb_planter",
+        "bomb_defuser",
+        "plant_site",
+        "plant_round_time",
+        "defuse_round_time",
+        "_stats",
+        "_kills",
+        "_damage",
+    )
+
+    def __init__(self, raw: t.Mapping[str, t.Any]):
+        """One entry from a match's roundResults; kills and damage are built on first access"""
+        self.number = raw.get("roundNum")
+        self.result = _intern(raw.get("roundResult"))
+        self.result_code = _intern(raw.get("roundResultCode"))
+        self.winning_team = _intern(raw.get("winningTeam"))
+        self.bomb_planter = _intern(raw.get("bombPlanter"))
+        self.bomb_defuser = _intern(raw.get("bombDefuser"))
+        self.plant_site = _intern(raw.get("plantSite"))
+        self.plant_round_time = raw.get("plantRoundTime")
+        self.defuse_round_time = raw.get("defuseRoundTime")
+        self._stats = raw.get("playerStats") or []
+        self._kills = _missing
+        self._damage = _missing
+
+    @property
+    def kills(self) -> t.Tuple[Kill, ...]:
+        if self._kills is _missing:
+            self._kills = tuple(Kill(kill) for stats in self._stats for kill in stats.get("kills") or ())
+            self.__release()
+        return self._kills
+
+    @property
+    def damage(self) -> t.Tuple[DamageEvent, ...]:
+        if self._damage is _missing:
+            self._damage = tuple(
+                DamageEvent(self.number, stats.get("subject"), damage)
+                for stats in self._stats
+                for damage in stats.get("damage") or ()
+            )
+            self.__release()
+        return self._damage
+
+    def __release(self) -> None:
+        # the raw player stats aren't needed once both views are built
+        if self._kills is not _missing and self._damage is not _missing:
+            self._stats = None
+
+    def __repr__(self):
+        return f"Round(number={self.number!r}, winning_team={self.winning_team!r}, result={self.result!r})"
+
+
+class Match:
+    __slots__ = ("_data", "_decoder", "_info", "_players", "_teams", "_rounds", "_kills")
+
+    def __init__(self, data: t.Union[t.Mapping[str, t.Any], bytes], decoder: t.Callable[[bytes], t.Any] = json.loads):
+        """
+        Typed view over a fetch_match_details payload
+        data: the decoded payload, or the raw body (e.g. from fetch(..., raw=True)), decoded on first access with decoder
+
+        each section (players, rounds, kills) is converted to slotted objects the first time it's read
+        and the raw section is dropped; call compact() to convert everything up front
+        """
+        if isinstance(data, (bytes, bytearray, str)):
+            self._data = data
+        else:
+            # shallow copy so sections can be dropped without touching the caller's dict
+            self._data = dict(data)
+        self._decoder = decoder
+        self._info = _missing
+        self._players = _missing
+        self._teams = _missing
+        self._rounds = _missing
+        self._kills = _missing
+
+    def __repr__(self):
+        return f"Match(match_id={self.match_id!r}, map_id={self.map_id!r})"
+
+    def compact(self) -> "Match":
+        """Convert every section now and release the raw payload"""
+        for section in ("info", "players", "teams", "kills"):
+            getattr(self, section)
+        for round_ in self.rounds:
+            round_.kills
+            round_.damage
+        self._data = None
+        return self
+
+    def _take(self, key):
+        if isinstance(self._data, (bytes, bytearray, str)):
+            self._data = dict(self._decoder(self._data))
+        if self._data is None:
+            return None
+        return self._data.pop(key, None)
+
+    @property
+    def info(self) -> t.Mapping[str, t.Any]:
+        """The raw matchInfo section"""
+        if self._info is _missing:
+            self._info = self._take("matchInfo") or {}
+        return self._info
+
+    @property
+    def match_id(self) -> t.Optional[t.Text]:
+        return self.info.get("matchId")
+
+    @property
+    def map_id(self) -> t.Optional[t.Text]:
+        return self.info.get("mapId")
+
+    @property
+    def queue_id(self) -> t.Optional[t.Text]:
+        return self.info.get("queueID")
+
+    @property
+    def season_id(self) -> t.Optional[t.Text]:
+        return self.info.get("seasonId")
+
+    @property
+    def game_start(self) -> t.Optional[int]:
+        """Start time in epoch milliseconds"""
+        return self.info.get("gameStartMillis")
+
+    @property
+    def game_length(self) -> t.Optional[int]:
+        """Length in milliseconds"""
+        return self.info.get("gameLengthMillis")
+
+    @property
+    def is_completed(self) -> bool:
+        return bool(self.info.get("isCompleted"))
+
+    @property
+    def is_ranked(self) -> bool:
+        return bool(self.info.get("isRanked"))
+
+    @property
+    def players(self) -> t.Tuple[Player, ...]:
+        if self._players is _missing:
+            self._players = tuple(Player(player) for player in self._take("players") or ())
+        return self._players
+
+    @property
+    def teams(self) -> t.Mapping[str, bool]:
+        """{team id: won}"""
+        if self._teams is _missing:
+            self._teams = {_intern(team.get("teamId")): bool(team.get("won")) for team in self._take("teams") or ()}
+        return self._teams
+
+    @property
+    def rounds(self) -> t.Tuple[Round, ...]:
+        if self._rounds is _missing:
+            self._rounds = tuple(Round(round_) for round_ in self._take("roundResults") or ())
+        return self._rounds
+
+    @property
+    def kills(self) -> t.Tuple[Kill, ...]:
+        if self._kills is _missing:
+            kills = self._take("kills")
+            if kills is None:
+                # some payloads only list kills per round
+                self._kills = tuple(kill for round_ in self.rounds for kill in round_.kills)
+            else:
+                self._kills = tuple(Kill(kill) for kill in kills)
+        return self._kills
+
+    @property
+    def damage(self) -> t.Tuple[DamageEvent, ...]:
+        return tuple(damage for round_ in self.rounds for damage in round_.damage)
+
+    @property
+    def winning_team(self) -> t.Optional[t.Text]:
+        for team_id, won in self.teams.items():
+            if won:
+                return team_id
+        return None
+
+    def player(self, puuid: t.Text) -> t.Optional[Player]:
+        """Get a player by puuid, or None if they weren't in the match"""
+        for player in self.players:
+            if player.subject == puuid:
+                return player
+        return None
@@ -0,0 +1,230 @@
+import typing as t
+import contextvars
+import functools
+import inspect
+import threading
+
+# upper bounds (seconds) of the latency histogram buckets
+latency_buckets = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# Client methods that are plumbing rather than endpoints, never used as labels
+_internal_methods = {
+    "fetch",
+    "post",
+    "put",
+    "delete",
+    "request",
+    "activate",
+    "prewarm",
+    "close",
+    "invalidate_cache",
+    "clear_session_state",
+    "export_state",
+    "local_events",
+}
+
+# name of the endpoint method the current request is being made for, see label_endpoints
+current_method = contextvars.ContextVar("valclient_method", default=None)
+
+
+async def _labelled(awaitable, name):
+    token = current_method.set(name)
+    try:
+        return await awaitable
+    finally:
+        current_method.reset(token)
+
+
+def _label(name, method):
+    @functools.wraps(method)
+    def labelled(*args, **kwargs):
+        token = current_method.set(name)
+        try:
+            result = method(*args, **kwargs)
+        finally:
+            current_method.reset(token)
+        # coroutines (AsyncClient endpoints, or inherited ones returning fetch()'s coroutine) run after
+        # this returns, so the label has to be set again while they're awaited
+        if inspect.isawaitable(result):
+            return _labelled(result, name)
+        return result
+
+    return labelled
+
+
+def label_endpoints(cls):
+    """Class decorator that makes every public endpoint method of a client set current_method while it runs"""
+    for name, value in list(vars(cls).items()):
+        if name.startswith("_") or name in _internal_methods or not inspect.isfunction(value):
+            continue
+        setattr(cls, name, _label(name, value))
+    return cls
+
+
+def calling_method(default: t.Text) -> t.Text:
+    """Get the endpoint method the current request is for (e.g. coregame_fetch_match), or default outside of one"""
+    name = current_method.get()
+    return name if name is not None else default
+
+
+class Metrics:
+    def __init__(self, buckets: t.Sequence[float] = latency_buckets):
+        """
+        Request counters for a Client, labelled by endpoint family (pd, glz, shared, local) and method name
+        read them with as_dict() or to_prometheus()
+        """
+        self.buckets = tuple(buckets)
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Zero every counter"""
+        with self.lock:
+            self.requests = {}  # (family, method): count
+            self.statuses = {}  # (family, method, status): count
+            self.errors = {}  # (family, method): count of requests that got no response
+            self.latency = {}  # (family, method): [bucket counts..., +Inf count, sum]
+            self.bytes_in = {}  # (family, method): bytes received
+            self.bytes_out = {}  # (family, method): bytes sent
+            self.reauths = {}  # (family, method): count of 400-triggered token refreshes
+
+    def observe(
+        self,
+        family: t.Text,
+        method: t.Text,
+        status: t.Optional[int],
+        latency: float,
+        bytes_in: int = 0,
+        bytes_out: int = 0,
+    ) -> None:
+        """Record one request attempt; status is None if it failed without a response"""
+        key = (family, method)
+        with self.lock:
+            self.requests[key] = self.requests.get(key, 0) + 1
+            if status is None:
+                self.errors[key] = self.errors.get(key, 0) + 1
+            else:
+                status_key = (family, method, status)
+                self.statuses[status_key] = self.statuses.get(status_key, 0) + 1
+            histogram = self.latency.setdefault(key, [0] * (len(self.buckets) + 2))
+            for i, bound in enumerate(self.buckets):
+                if latency <= bound:
+                    histogram[i] += 1
+            histogram[-2] += 1
+            histogram[-1] += latency
+            self.bytes_in[key] = self.bytes_in.get(key, 0) + bytes_in
+            self.bytes_out[key] = self.bytes_out.get(key, 0) + bytes_out
+
+    def observe_reauth(self, family: t.Text, method: t.Text) -> None:
+        """Record a token refresh triggered by a rejected request"""
+        key = (family, method)
+        with self.lock:
+            self.reauths[key] = self.reauths.get(key, 0) + 1
+
+    def as_dict(self) -> t.Mapping[str, t.Any]:
+        """
+        Snapshot of every counter as {family: {method: {...}}}
+        latency is {"buckets": {upper bound: cumulative count}, "count": n, "sum": seconds}
+        """
+        with self.lock:
+            keys = set(self.requests) | set(self.reauths)
+            snapshot = {}
+            for family, method in sorted(keys):
+                key = (family, method)
+                histogram = self.latency.get(key, [0] * (len(self.buckets) + 2))
+                snapshot.setdefault(family, {})[method] = {
+                    "requests": self.requests.get(key, 0),
+                    "errors": self.errors.get(key, 0),
+                    "statuses": {
+                        status: count
+                        for (f, m, status), count in self.statuses.items()
+                        if (f, m) == key
+                    },
+                    "latency": {
+                        "buckets": dict(zip(self.buckets, histogram)),
+                        "count": histogram[-2],
+                        "sum": histogram[-1],
+                    },
+                    "bytes_in": self.bytes_in.get(key, 0),
+                    "bytes_out": self.bytes_out.get(key, 0),
+                    "reauths": self.reauths.get(key, 0),
+                }
+            return snapshot
+
+    def to_prometheus(self, prefix: t.Text = "valclient") -> t.Text:
+        """Snapshot of every counter in the Prometheus text exposition format"""
+        lines = []
+        snapshot = self.as_dict()
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            lines.extend(samples)
+
+        def labels(family, method, **extra):
+            pairs = [("family", family), ("method", method)] + list(extra.items())
+            return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+        rows = [
+            (family, method, stats)
+            for family, methods in snapshot.items()
+            for method, stats in methods.items()
+        ]
+
+        metric(
+            "requests_total",
+            "counter",
+            "Requests sent, including retries",
+            [f"{prefix}_requests_total{labels(f, m)} {s['requests']}" for f, m, s in rows],
+        )
+        metric(
+            "request_errors_total",
+            "counter",
+            "Requests that failed without a response",
+            [f"{prefix}_request_errors_total{labels(f, m)} {s['errors']}" for f, m, s in rows],
+        )
+        metric(
+            "responses_total",
+            "counter",
+            "Responses by status code",
+            [
+                f"{prefix}_responses_total{labels(f, m, status=status)} {count}"
+                for f, m, s in rows
+                for status, count in sorted(s["statuses"].items())
+            ],
+        )
+        histogram_samples = []
+        for f, m, s in rows:
+            for bound, count in s["latency"]["buckets"].items():
+                histogram_samples.append(
+                    f"{prefix}_request_duration_seconds_bucket{labels(f, m, le=bound)} {count}"
+                )
+            histogram_samples.append(
+                f"{prefix}_request_duration_seconds_bucket{labels(f, m, le='+Inf')} {s['latency']['count']}"
+            )
+            histogram_samples.append(
+                f"{prefix}_request_duration_seconds_sum{labels(f, m)} {s['latency']['sum']}"
+            )
+            histogram_samples.append(
+                f"{prefix}_request_duration_seconds_count{labels(f, m)} {s['latency']['count']}"
+            )
+        metric("request_duration_seconds", "histogram", "Request latency", histogram_samples)
+        metric(
+            "received_bytes_total",
+            "counter",
+            "Response body bytes received",
+            [f"{prefix}_received_bytes_total{labels(f, m)} {s['bytes_in']}" for f, m, s in rows],
+        )
+        metric(
+            "sent_bytes_total",
+            "counter",
+            "Request body bytes sent",
+            [f"{prefix}_sent_bytes_total{labels(f, m)} {s['bytes_out']}" for f, m, s in rows],
+        )
+        metric(
+            "reauths_total",
+            "counter",
+            "Token refreshes triggered by rejected requests",
+            [f"{prefix}_reauths_total{labels(f, m)} {s['reauths']}" for f, m, s in rows],
+        )
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,193 @@
+import typing as t
+import copy
+import threading
+import time
+
+from .resources import region_shard_override
+from .exceptions import HandshakeError
+
+
+class _Account:
+    __slots__ = ("client", "in_flight", "last_used", "available_at", "needs_activation", "rate_limits", "auth_failures")
+
+    def __init__(self, client):
+        self.client = client
+        self.in_flight = 0
+        self.last_used = 0
+        self.available_at = 0  # monotonic time the account is back in rotation
+        self.needs_activation = False  # lost auth; re-activated before its next use
+        self.rate_limits = 0
+        self.auth_failures = 0
+
+
+class ClientPool:
+    def __init__(
+        self,
+        clients: t.Iterable = (),
+        cooldown: float = 60,
+        auth_cooldown: float = 300,
+    ):
+        """
+        Spreads requests over many activated Clients (one per account), routing each to an account on the right shard
+
+        clients: activated Clients, on any mix of shards
+        cooldown: seconds an account is out of rotation after a request gives up on a 429
+        (while the client is still retrying, it sits out the Retry-After instead)
+        auth_cooldown: seconds an account is out of rotation after it loses auth; it's re-activated before it's used again
+
+        requests go to the healthy account on the shard with the fewest requests in flight, e.g.
+        pool.call("eu", "fetch_mmr", puuid) or pool.call("eu", lambda client: client.fetch_match_details(match_id))
+        """
+        self.cooldown = cooldown
+        self.auth_cooldown = auth_cooldown
+        self.accounts = {}  # shard: [_Account]
+        self.condition = threading.Condition()
+        self.local = threading.local()
+        for client in clients:
+            self.add(client)
+
+    def add(self, client) -> None:
+        """Put an activated client into rotation"""
+        account = _Account(client)
+        # the pool watches every attempt for 429s; give the client its own policy so the hook can't leak to clients sharing one
+        policy = copy.copy(client.retry_policy)
+        user_callback = client.retry_policy.on_attempt
+
+        def on_attempt(attempt):
+            if attempt["delay"] is None:
+                self.local.final_attempt = attempt
+            if attempt["status"] == 429:
+                # sit out the Retry-After while the client retries, or the full cooldown if it gave up
+                self.__rate_limited(account, attempt["delay"] if attempt["delay"] is not None else self.cooldown)
+            if user_callback is not None:
+                user_callback(attempt)
+
+        policy.on_attempt = on_attempt
+        client.retry_policy = policy
+        with self.condition:
+            self.accounts.setdefault(client.shard, []).append(account)
+            self.condition.notify_all()
+
+    def remove(self, client) -> None:
+        """Take a client out of the pool"""
+        with self.condition:
+            accounts = self.accounts.get(client.shard, [])
+            self.accounts[client.shard] = [account for account in accounts if account.client is not client]
+
+    def shards(self) -> t.List[t.Text]:
+        return [shard for shard, accounts in self.accounts.items() if len(accounts) > 0]
+
+    def stats(self) -> t.Mapping[str, t.List[t.Mapping[str, t.Any]]]:
+        """Per-shard account health: {shard: [{"puuid", "healthy", "in_flight", "rate_limits", "auth_failures"}]}"""
+        now = time.monotonic()
+        with self.condition:
+            return {
+                shard: [
+                    {
+                        "puuid": account.client.puuid,
+                        "healthy": account.available_at <= now and not account.needs_activation,
+                        "in_flight": account.in_flight,
+                        "rate_limits": account.rate_limits,
+                        "auth_failures": account.auth_failures,
+                    }
+                    for account in accounts
+                ]
+                for shard, accounts in self.accounts.items()
+            }
+
+    def call(self, region: t.Text, method: t.Union[t.Text, t.Callable], *args, **kwargs) -> t.Any:
+        """
+        Run a Client method (by name, or a function taking the client) on an account that serves region
+        If the account gets rate limited or loses auth along the way, it's taken out of rotation and the call
+        is retried on another one (each account is tried at most once); blocks while every account is cooling down,
+        and raises HandshakeError once every account on the shard has failed to re-activate
+        """
+        shard = region_shard_override.get(region, region)
+        tried = set()
+        while True:
+            account = self.__acquire(shard, tried)
+            tried.add(id(account))
+            self.local.final_attempt = None
+            try:
+                if callable(method):
+                    result = method(account.client, *args, **kwargs)
+                else:
+                    result = getattr(account.client, method)(*args, **kwargs)
+            except HandshakeError:
+                self.__auth_lost(account)
+                if self.__exhausted(shard, tried):
+                    raise
+                continue
+            finally:
+                self.__release(account)
+
+            final_attempt = self.local.final_attempt
+            if final_attempt is not None and final_attempt["status"] in (401, 403):
+                self.__auth_lost(account)
+            elif final_attempt is None or final_attempt["status"] != 429:
+                return result
+            if self.__exhausted(shard, tried):
+                return result
+
+    def __acquire(self, shard, tried) -> _Account:
+        tried = set(tried)
+        failed = set()  # accounts that failed re-activation during this call
+        while True:
+            with self.condition:
+                while True:
+                    accounts = self.accounts.get(shard)
+                    if not accounts:
+                        raise ValueError(f"No clients in the pool serve the {shard} shard")
+                    if all(id(account) in failed for account in accounts):
+                        raise HandshakeError(f"Every account on the {shard} shard failed to re-authenticate")
+                    now = time.monotonic()
+                    candidates = [account for account in accounts if id(account) not in tried] or [
+                        account for account in accounts if id(account) not in failed
+                    ]
+                    ready = [account for account in candidates if account.available_at <= now]
+                    if len(ready) > 0:
+                        account = min(ready, key=lambda account: (account.in_flight, account.last_used))
+                        account.in_flight += 1
+                        account.last_used = now
+                        if not account.needs_activation:
+                            return account
+                        account.available_at = float("inf")  # keep other callers off it while it re-activates
+                        break
+                    # accounts being re-activated have no deadline; they wake the waiters once they're done
+                    deadlines = [account.available_at for account in candidates if account.available_at != float("inf")]
+                    self.condition.wait(min(deadlines) - now if deadlines else None)
+
+            # recovering from lost auth; activate outside the lock so other shards/accounts aren't held up
+            try:
+                account.client.activate()
+            except HandshakeError:
+                self.__release(account)
+                self.__auth_lost(account)
+                tried.add(id(account))
+                failed.add(id(account))
+                continue
+            with self.condition:
+                account.needs_activation = False
+                account.available_at = 0
+                self.condition.notify_all()
+            return account
+
+    def __release(self, account) -> None:
+        with self.condition:
+            account.in_flight -= 1
+            self.condition.notify_all()
+
+    def __rate_limited(self, account, delay) -> None:
+        with self.condition:
+            account.rate_limits += 1
+            account.available_at = max(account.available_at, time.monotonic() + delay)
+
+    def __auth_lost(self, account) -> None:
+        with self.condition:
+            account.auth_failures += 1
+            account.needs_activation = True
+            account.available_at = time.monotonic() + self.auth_cooldown
+
+    def __exhausted(self, shard, tried) -> bool:
+        with self.condition:
+            return all(id(account) in tried for account in self.accounts.get(shard, []))
@@ -0,0 +1,75 @@
+import typing as t
+import base64
+import json
+
+_missing = object()
+
+
+class Presence:
+    __slots__ = ("raw", "_private")
+
+    def __init__(self, raw: t.Mapping[str, t.Any]):
+        """One entry from /chat/v4/presences; the base64 private blob is only decoded on first access"""
+        self.raw = raw
+        self._private = _missing
+
+    @property
+    def puuid(self) -> t.Text:
+        return self.raw["puuid"]
+
+    @property
+    def game_name(self) -> t.Optional[t.Text]:
+        return self.raw.get("game_name")
+
+    @property
+    def game_tag(self) -> t.Optional[t.Text]:
+        return self.raw.get("game_tag")
+
+    @property
+    def product(self) -> t.Optional[t.Text]:
+        return self.raw.get("product")
+
+    @property
+    def state(self) -> t.Optional[t.Text]:
+        return self.raw.get("state")
+
+    @property
+    def private(self) -> t.Optional[t.Mapping[str, t.Any]]:
+        """The decoded private presence (party, game phase, score, etc.), or None if it can't be decoded"""
+        if self._private is _missing:
+            try:
+                self._private = json.loads(base64.b64decode(self.raw["private"]))
+            except:
+                self._private = None
+        return self._private
+
+
+class PresenceSnapshot:
+    def __init__(self, data: t.Mapping[str, t.Any]):
+        """
+        All presences from one /chat/v4/presences download, indexed by puuid
+        when a player has more than one presence, the first one listed is kept (same as Client.fetch_presence)
+        """
+        self.raw = data
+        self.presences = {}
+        for presence in data.get("presences") or []:
+            if "puuid" in presence:
+                self.presences.setdefault(presence["puuid"], Presence(presence))
+
+    def __contains__(self, puuid: t.Text) -> bool:
+        return puuid in self.presences
+
+    def __len__(self) -> int:
+        return len(self.presences)
+
+    def __iter__(self) -> t.Iterator[Presence]:
+        return iter(self.presences.values())
+
+    def get(self, puuid: t.Text) -> t.Optional[Presence]:
+        """Get a player's presence, or None if they're offline/not a friend"""
+        return self.presences.get(puuid)
+
+    def private(self, puuid: t.Text) -> t.Optional[t.Mapping[str, t.Any]]:
+        """Get a player's decoded private presence, or None"""
+        presence = self.presences.get(puuid)
+        return presence.private if presence is not None else None
@@ -0,0 +1,134 @@
+import typing as t
+import asyncio
+import contextlib
+import contextvars
+import email.utils
+import threading
+import time
+
+INTERACTIVE = 0
+BACKGROUND = 1
+
+# priority of the requests made in the current thread/task, see RequestScheduler.background
+current_priority = contextvars.ContextVar("valclient_priority", default=INTERACTIVE)
+
+
+def parse_retry_after(value: t.Optional[t.Text], default: float = 1) -> float:
+    """Get the number of seconds to wait from a Retry-After header (delta-seconds or an HTTP date)"""
+    if value is None:
+        return default
+    try:
+        return max(0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return default
+
+
+class TokenBucket:
+    def __init__(self, rate: t.Optional[float] = None, burst: t.Optional[float] = None):
+        """
+        rate: requests per second (None for no limit)
+        burst: max requests that can be made at once after being idle (defaults to rate)
+        """
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(1, rate or 1)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0
+
+    def take(self, now: float) -> float:
+        """Take a token; returns 0 if one was taken, otherwise how many seconds until one is available"""
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        if self.rate is None:
+            return 0
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / self.rate
+
+
+class RequestScheduler:
+    def __init__(self, budgets: t.Optional[t.Mapping[t.Text, t.Tuple[float, float]]] = None):
+        """
+        Paces requests with a token bucket per endpoint family (pd, glz, shared, local) and shard
+
+        budgets: {"pd": (requests per second, burst), "glz:eu": (rate, burst), ...}
+        a "family:shard" key takes precedence over a plain "family" key; families without a budget are
+        unlimited but still wait out any Retry-After the server sends
+
+        requests made inside `with scheduler.background():` yield to interactive ones waiting on the same bucket
+        """
+        self.budgets = dict(budgets or {})
+        self.buckets = {}
+        self.waiting = {}  # (family:shard, priority): number of waiting callers
+        self.condition = threading.Condition()
+
+    @staticmethod
+    @contextlib.contextmanager
+    def background():
+        """Mark the requests made in this block as background work (crawls, syncs, etc.)"""
+        token = current_priority.set(BACKGROUND)
+        try:
+            yield
+        finally:
+            current_priority.reset(token)
+
+    def acquire(self, family: t.Text, shard: t.Text) -> None:
+        """Block until a request to family/shard is allowed"""
+        key = f"{family}:{shard}"
+        priority = current_priority.get()
+        with self.condition:
+            self.__add_waiter(key, priority, 1)
+            try:
+                while True:
+                    wait = self.__try_take(key, priority)
+                    if wait == 0:
+                        return
+                    self.condition.wait(wait)
+            finally:
+                self.__add_waiter(key, priority, -1)
+                self.condition.notify_all()
+
+    async def acquire_async(self, family: t.Text, shard: t.Text) -> None:
+        """Wait (without blocking the event loop) until a request to family/shard is allowed"""
+        key = f"{family}:{shard}"
+        priority = current_priority.get()
+        with self.condition:
+            self.__add_waiter(key, priority, 1)
+        try:
+            while True:
+                with self.condition:
+                    wait = self.__try_take(key, priority)
+                if wait == 0:
+                    return
+                await asyncio.sleep(wait)
+        finally:
+            with self.condition:
+                self.__add_waiter(key, priority, -1)
+                self.condition.notify_all()
+
+    def penalize(self, family: t.Text, shard: t.Text, retry_after: float) -> None:
+        """Hold every request to family/shard for retry_after seconds (after a 429)"""
+        with self.condition:
+            bucket = self.__bucket(f"{family}:{shard}")
+            bucket.blocked_until = max(bucket.blocked_until, time.monotonic() + retry_after)
+
+    def __try_take(self, key, priority) -> float:
+        if priority == BACKGROUND and self.waiting.get((key, INTERACTIVE), 0) > 0:
+            return 0.05  # let the interactive callers go first
+        return self.__bucket(key).take(time.monotonic())
+
+    def __bucket(self, key) -> TokenBucket:
+        if key not in self.buckets:
+            budget = self.budgets.get(key, self.budgets.get(key.split(":")[0]))
+            self.buckets[key] = TokenBucket(*budget) if budget is not None else TokenBucket()
+        return self.buckets[key]
+
+    def __add_waiter(self, key, priority, count) -> None:
+        self.waiting[(key, priority)] = self.waiting.get((key, priority), 0) + count
@@ -0,0 +1,72 @@
+import typing as t
+import random
+
+# methods that are safe to send again after a timeout; the server may already have applied a timed-out write
+idempotent_methods = {"GET", "HEAD", "OPTIONS"}
+
+
+class RetryPolicy:
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        base_delay: float = 0.25,
+        max_delay: float = 8,
+        max_elapsed: float = 30,
+        timeout: t.Optional[float] = 10,
+        retry_statuses: t.Iterable[int] = (429, 500, 502, 503, 504),
+        retry_write_timeouts: bool = False,
+        on_attempt: t.Optional[t.Callable[[t.Mapping[str, t.Any]], None]] = None,
+    ):
+        """
+        How Client retries requests that fail for transient reasons (connection errors, timeouts, 5xx, 429)
+
+        max_attempts: max number of times a request is sent, including the first one
+        base_delay/max_delay: exponential backoff bounds in seconds; the actual delay is picked at random below the bound (full jitter)
+        max_elapsed: give up once retrying would take longer than this many seconds since the first attempt
+        timeout: seconds to wait on a single attempt before it counts as failed (None to wait forever)
+        retry_statuses: status codes that are retried
+        retry_write_timeouts: also retry POST/PUT/DELETE requests that timed out after they may have been sent
+        (by default those are only retried on connection errors, when the server never got them)
+        on_attempt: called after every attempt with a dict describing it (method, endpoint, endpoint_type,
+        attempt, status, error, elapsed, delay); delay is None when the request won't be retried
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_elapsed = max_elapsed
+        self.timeout = timeout
+        self.retry_statuses = set(retry_statuses)
+        self.retry_write_timeouts = retry_write_timeouts
+        self.on_attempt = on_attempt
+
+    def next_delay(
+        self,
+        attempt: int,
+        elapsed: float,
+        status: t.Optional[int] = None,
+        error: t.Optional[Exception] = None,
+        retry_after: t.Optional[float] = None,
+        method: t.Optional[t.Text] = None,
+        timed_out: bool = False,
+    ) -> t.Optional[float]:
+        """
+        Get how long to wait before the next attempt, or None if the request shouldn't be retried
+        timed_out: the error is a timeout after the request may have reached the server
+        """
+        if error is None and status not in self.retry_statuses:
+            return None
+        if timed_out and (method or "").upper() not in idempotent_methods and not self.retry_write_timeouts:
+            return None
+        if attempt >= self.max_attempts:
+            return None
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        if elapsed + delay > self.max_elapsed:
+            return None
+        return delay
+
+    def report(self, **attempt) -> None:
+        """Pass an attempt's details to on_attempt"""
+        if self.on_attempt is not None:
+            self.on_attempt(attempt)
@@ -0,0 +1,81 @@
+import typing as t
+import threading
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+
+endpoint_families = ["pd", "glz", "shared", "local"]
+
+
+class SessionPool:
+    def __init__(
+        self,
+        pool_connections: int = 4,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+    ):
+        """
+        Keeps one persistent requests session per endpoint family (pd, glz, shared, local)
+        so connections and TLS sessions are reused across calls
+
+        pool_connections: number of per-host pools kept by each session
+        pool_maxsize: max connections kept open per host
+        pool_block: if True, never open more than pool_maxsize connections per host (callers wait instead)
+        keep_alive: if False, every request closes its connection after the response
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.sessions = {}
+        self.lock = threading.Lock()
+
+    def get(self, endpoint_type: t.Text) -> requests.Session:
+        """Get the session for an endpoint family, creating it on first use"""
+        if endpoint_type not in endpoint_families:
+            raise ValueError(
+                f"Invalid endpoint type, valid types are: {endpoint_families}"
+            )
+        session = self.sessions.get(endpoint_type)
+        if session is None:
+            with self.lock:
+                session = self.sessions.get(endpoint_type)
+                if session is None:
+                    session = self.sessions[endpoint_type] = self.__build_session()
+        return session
+
+    def prewarm(self, urls: t.Mapping[t.Text, t.Text], timeout: float = 5) -> None:
+        """
+        Open a connection per endpoint family ahead of the first real request
+        urls: {endpoint family: base url}; any response (even an error status) leaves the connection pooled
+        """
+        def connect(item):
+            endpoint_type, url = item
+            try:
+                self.get(endpoint_type).head(f"{url}/", timeout=timeout)
+            except requests.RequestException:
+                pass
+
+        with ThreadPoolExecutor(max_workers=max(1, len(urls))) as executor:
+            list(executor.map(connect, urls.items()))
+
+    def close(self) -> None:
+        """Close every open session and drop their connections"""
+        with self.lock:
+            sessions, self.sessions = self.sessions, {}
+        for session in sessions.values():
+            session.close()
+
+    def __build_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        if not self.keep_alive:
+            session.headers["Connection"] = "close"
+        return session
@@ -0,0 +1,87 @@
+import typing as t
+import asyncio
+import base64
+import json
+import threading
+import time
+
+
+def jwt_expiry(token: t.Text) -> t.Optional[float]:
+    """Read the exp claim (unix time) out of a JWT without verifying it"""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)  # jwt strips base64 padding
+        return float(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+    except:
+        return None
+
+
+def token_expiry(headers: t.Mapping[t.Text, t.Any]) -> t.Optional[float]:
+    """Read the expiry (unix time) out of the bearer token in a set of pd/glz headers"""
+    try:
+        return jwt_expiry(headers["Authorization"].split(" ")[1])
+    except:
+        return None
+
+
+class TokenManager:
+    def __init__(self, refresh: t.Callable[[], t.Optional[float]], refresh_margin: float = 60):
+        """
+        Tracks when the client's tokens expire and refreshes them shortly before they do
+
+        refresh: callable that fetches new tokens and returns their expiry as unix time (or None if unknown)
+        refresh_margin: seconds before expiry at which tokens are refreshed
+
+        Only one refresh runs at a time; callers that find the tokens stale while a refresh
+        is in flight wait for it and reuse its result instead of starting another
+        """
+        self.refresher = refresh
+        self.refresh_margin = refresh_margin
+        self.expires_at = None
+        self.generation = 0  # bumped on every refresh
+        self.lock = threading.Lock()
+
+    def stale(self) -> bool:
+        """Check if the tokens are expired or about to be"""
+        return self.expires_at is not None and time.time() >= self.expires_at - self.refresh_margin
+
+    def ensure_fresh(self) -> None:
+        """Refresh the tokens if they're about to expire"""
+        if self.stale():
+            self.refresh(self.generation)
+
+    def refresh(self, seen_generation: t.Optional[int] = None) -> None:
+        """
+        Refresh the tokens
+        seen_generation: the generation the caller's failed request used; if a refresh already
+        happened since then, this waits for it instead of refreshing again
+        """
+        with self.lock:
+            if seen_generation is not None and seen_generation != self.generation:
+                return
+            self.expires_at = self.refresher()
+            self.generation += 1
+
+
+class AsyncTokenManager(TokenManager):
+    def __init__(self, refresh: t.Callable[[], t.Awaitable[t.Optional[float]]], refresh_margin: float = 60):
+        """TokenManager for AsyncClient; refresh is a coroutine function"""
+        super().__init__(refresh, refresh_margin=refresh_margin)
+        self.lock = asyncio.Lock()
+
+    async def ensure_fresh(self) -> None:
+        """Refresh the tokens if they're about to expire"""
+        if self.stale():
+            await self.refresh(self.generation)
+
+    async def refresh(self, seen_generation: t.Optional[int] = None) -> None:
+        """
+        Refresh the tokens
+        seen_generation: the generation the caller's failed request used; if a refresh already
+        happened since then, this waits for it instead of refreshing again
+        """
+        async with self.lock:
+            if seen_generation is not None and seen_generation != self.generation:
+                return
+            self.expires_at = await self.refresher()
+            self.generation += 1
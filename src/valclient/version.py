@@ -0,0 +1,98 @@
+import typing as t
+import json
+import os
+import threading
+import time
+
+
+class VersionCache:
+    def __init__(
+        self,
+        ttl: float = 60 * 60,
+        path: t.Optional[t.Text] = None,
+        version: t.Optional[t.Text] = None,
+    ):
+        """
+        Caches the client version string sent in the X-Riot-ClientVersion header
+
+        ttl: seconds before the cached version is revalidated; stale versions keep being served while a
+        background refresh runs, so only the very first lookup waits on valorant-api.com
+        path: optional JSON file the version is saved to, so it survives restarts
+        version: pin the version; when set, valorant-api.com is never contacted
+        """
+        self.ttl = ttl
+        self.path = path
+        self.pinned = version
+        self.version = None
+        self.fetched_at = 0
+        self.revalidating = False
+        self.lock = threading.Lock()
+
+        if path is not None and os.path.exists(path):
+            try:
+                with open(path) as f:
+                    data = json.load(f)
+                self.version = data["version"]
+                self.fetched_at = data["fetched_at"]
+            except:  # a broken cache file just means fetching the version again
+                pass
+
+    def current(self) -> t.Optional[t.Text]:
+        """Get the pinned or cached version (even if it's stale), or None if there isn't one yet"""
+        return self.pinned if self.pinned is not None else self.version
+
+    def stale(self) -> bool:
+        """Check if the cached version should be revalidated"""
+        return self.pinned is None and time.time() >= self.fetched_at + self.ttl
+
+    def pin(self, version: t.Optional[t.Text]) -> None:
+        """Always use this version (None to unpin)"""
+        self.pinned = version
+
+    def set(self, version: t.Text) -> None:
+        """Store a freshly fetched version"""
+        with self.lock:
+            self.version = version
+            self.fetched_at = time.time()
+            self.revalidating = False
+            if self.path is not None:
+                with open(self.path, "w") as f:
+                    json.dump({"version": self.version, "fetched_at": self.fetched_at}, f)
+
+    def restore(self, version: t.Text, fetched_at: float) -> None:
+        """Keep a version fetched elsewhere in memory, as fresh as it was when it was fetched (it isn't saved to path)"""
+        with self.lock:
+            if self.version is None or fetched_at > self.fetched_at:
+                self.version = version
+                self.fetched_at = fetched_at
+
+    def begin_revalidation(self) -> bool:
+        """Claim the background revalidation; False if one is already running"""
+        with self.lock:
+            if self.revalidating:
+                return False
+            self.revalidating = True
+            return True
+
+    def end_revalidation(self) -> None:
+        with self.lock:
+            self.revalidating = False
+
+    def get(self, fetch: t.Callable[[], t.Text]) -> t.Text:
+        """
+        Get the version, calling fetch only when nothing is cached yet
+        a stale version is returned immediately and refreshed on a background thread
+        """
+        version = self.current()
+        if version is None:
+            version = fetch()
+            self.set(version)
+        elif self.stale() and self.begin_revalidation():
+            threading.Thread(target=self.__revalidate, args=(fetch,), daemon=True).start()
+        return version
+
+    def __revalidate(self, fetch) -> None:
+        try:
+            self.set(fetch())
+        except:  # keep serving the old version, try again on the next lookup
+            self.end_revalidation()
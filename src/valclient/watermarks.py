@@ -0,0 +1,57 @@
+import typing as t
+import abc
+import json
+import os
+import threading
+
+
+class WatermarkStore(abc.ABC):
+    """
+    Keeps the newest match seen for each tracked player, used by Client.sync_match_history
+    a watermark looks like {"MatchID": "...", "GameStartTime": 1620000000000}
+    subclass this and override get/set to keep watermarks somewhere else (redis, a database, etc.)
+    """
+
+    @abc.abstractmethod
+    def get(self, key: t.Text) -> t.Optional[t.Mapping[str, t.Any]]:
+        ...
+
+    @abc.abstractmethod
+    def set(self, key: t.Text, watermark: t.Mapping[str, t.Any]) -> None:
+        ...
+
+
+class MemoryWatermarkStore(WatermarkStore):
+    """Watermarks kept in a dict for the life of the process"""
+
+    def __init__(self):
+        self.watermarks = {}
+        self.lock = threading.Lock()
+
+    def get(self, key: t.Text) -> t.Optional[t.Mapping[str, t.Any]]:
+        with self.lock:
+            return self.watermarks.get(key)
+
+    def set(self, key: t.Text, watermark: t.Mapping[str, t.Any]) -> None:
+        with self.lock:
+            self.watermarks[key] = dict(watermark)
+
+
+class JSONWatermarkStore(MemoryWatermarkStore):
+    """Watermarks kept in memory and saved to a JSON file after every update"""
+
+    def __init__(self, path: t.Text):
+        super().__init__()
+        self.path = path
+        if os.path.exists(path):
+            with open(path) as f:
+                self.watermarks = json.load(f)
+
+    def set(self, key: t.Text, watermark: t.Mapping[str, t.Any]) -> None:
+        with self.lock:
+            self.watermarks[key] = dict(watermark)
+            # write to a temp file first so a crash never leaves a half-written file behind
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w") as f:
+                json.dump(self.watermarks, f)
+            os.replace(temp_path, self.path)